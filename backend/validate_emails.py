@@ -1,111 +1,439 @@
+import os
 import sys
 import json
 import re
+import string
 import socket
+import time
+import secrets
+import threading
+import asyncio
 import dns.resolver
+import dns.asyncresolver
 import smtplib
 import concurrent.futures
+import functools
+from collections import Counter, OrderedDict
+import operator
+import zlib
+from dataclasses import dataclass, field
 import redis
-from email.utils import parseaddr
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
-# Redis connection
 try:
-    redis_client = redis.Redis(host='localhost', port=6379, db=0, socket_timeout=2)
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JSON `default` hook for result dataclasses
+_to_dict = operator.methodcaller('to_dict')
+
+def _json_encode(obj) -> bytes:
+    """Serialize to compact UTF-8 JSON (dataclasses included), using orjson when installed"""
+    if orjson:
+        # orjson's native dataclass support drops underscore fields like _id,
+        # so let results convert themselves instead
+        return orjson.dumps(obj, default=_to_dict, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+    return json.dumps(obj, separators=(',', ':'), default=_to_dict).encode()
+
+def _json_dumps(obj) -> str:
+    """Serialize to a compact JSON string"""
+    if orjson:
+        return _json_encode(obj).decode()
+    return json.dumps(obj, separators=(',', ':'), default=_to_dict)
+
+def _json_loads(data):
+    """Parse JSON, using orjson when installed"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+# Redis connection, shared by all worker threads through one pool. A short
+# connect timeout keeps startup quick when Redis is down, and a Unix socket
+# can be used instead of TCP loopback via VALIDATOR_REDIS_SOCKET
+try:
+    redis_socket_path = os.environ.get('VALIDATOR_REDIS_SOCKET')
+    if redis_socket_path:
+        redis_pool = redis.ConnectionPool(
+            connection_class=redis.UnixDomainSocketConnection, path=redis_socket_path, db=0,
+            socket_timeout=2, socket_connect_timeout=0.2, max_connections=64, health_check_interval=30
+        )
+    else:
+        redis_pool = redis.ConnectionPool(
+            host='localhost', port=6379, db=0, socket_timeout=2, socket_connect_timeout=0.2,
+            socket_keepalive=True, max_connections=64, health_check_interval=30
+        )
+    redis_client = redis.Redis(connection_pool=redis_pool)
     REDIS_AVAILABLE = redis_client.ping()
 except:
     REDIS_AVAILABLE = False
-    print("Redis not available, continuing without caching")
+    print("Redis not available, continuing without caching", file=sys.stderr)
 
 # Cache expiration times
 CACHE_TTL_EMAIL = 60 * 60 * 24 * 7  # 7 days for email results
 CACHE_TTL_MX = 60 * 60 * 24         # 1 day for MX records
+CACHE_TTL_MX_LOCAL = 60 * 15        # 15 minutes for the in-process MX cache
+
+# In-process cache sizes, so long-running processes don't grow without bound
+CACHE_SIZE_EMAILS = int(os.environ.get('VALIDATOR_CACHE_SIZE_EMAILS', 200_000))
+CACHE_SIZE_DOMAINS = int(os.environ.get('VALIDATOR_CACHE_SIZE_DOMAINS', 10_000))
+
+# Keys per Redis MGET when loading cached results
+REDIS_BATCH_SIZE = 500
+
+# Concurrency limits (overridable via environment)
+MAX_WORKERS = int(os.environ.get('VALIDATOR_MAX_WORKERS', 20))
+MAX_WORKERS_PER_DOMAIN = int(os.environ.get('VALIDATOR_MAX_WORKERS_PER_DOMAIN', 2))
+# Many domains share the same MX hosts (Google Workspace, Office 365), so also
+# cap concurrent connections per MX host to avoid looking like a SYN flood
+MAX_CONNECTIONS_PER_MX = int(os.environ.get('VALIDATOR_MAX_CONNECTIONS_PER_MX', 6))
+# Threads for blocking MX lookups the async prefetch couldn't answer
+DNS_MAX_WORKERS = int(os.environ.get('VALIDATOR_DNS_MAX_WORKERS', 8))
+
+# Free mail providers accept or tarpit RCPT probes regardless of whether the
+# mailbox exists, so SMTP checks against them cost time without adding signal
+SKIP_SMTP_FOR_FREE_PROVIDERS = os.environ.get('VALIDATOR_SKIP_SMTP_FOR_FREE_PROVIDERS', '1') == '1'
+
+# SMTP connection settings
+SMTP_TIMEOUT = 5                        # Applies to connect and to every command/reply
+SMTP_EMAIL_DEADLINE = 15                # Total budget for trying MX hosts for one email
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100  # Recycle connections after this many recipients
+SMTP_MAX_IDLE_SECONDS = 100             # Drop pooled connections idle for longer than this
+SMTP_UNREACHABLE_TTL = 60 * 60          # Skip SMTP for domains whose MX hosts all failed
+CATCHALL_PROBE_RETRY_TTL = 60 * 10      # Wait before re-probing a domain whose catch-all probe failed
+# RCPT replies: accepted (251 = will forward) and temporary failures
+SMTP_ACCEPT_CODES = frozenset({250, 251})
+SMTP_TRANSIENT_CODES = frozenset({421, 450, 451})
+# RCPT replies that settle whether a mailbox exists; anything else is asked
+# again of the next MX host
+SMTP_DEFINITIVE_CODES = SMTP_ACCEPT_CODES | {550, 551, 553}
+# RCPT TO commands sent under one MAIL FROM (servers must accept at least 100)
+SMTP_MAX_RECIPIENTS_PER_TRANSACTION = 50
+
+# Longest address allowed in an SMTP path (RFC 5321)
+MAX_EMAIL_LENGTH = 254
+
+# Character classes counted in the local part of ASCII addresses
+ASCII_DIGITS = string.digits.encode('ascii')
+ASCII_LETTERS = string.ascii_letters.encode('ascii')
+
+# Email format pattern, compiled once at import. Used with fullmatch so a
+# trailing newline can't slip past the way it would with `$`
+EMAIL_FORMAT_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# Domain / local-part classification sets
+FREE_EMAIL_DOMAINS = frozenset({
+    'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'aol.com', 'icloud.com', 'mail.com'
+})
+ROLE_ACCOUNTS = frozenset({
+    'admin', 'info', 'support', 'sales', 'contact', 'help', 'noreply', 'no-reply', 'webmaster'
+})
+NO_REPLY_PREFIXES = ('noreply', 'no-reply')
+DISPOSABLE_DOMAINS = frozenset({
+    'tempmail.com', 'temp-mail.org', 'guerrillamail.com', 'mailinator.com',
+    'trashmail.com', 'yopmail.com', 'sharklasers.com', '10minutemail.com'
+})
+
+# MX hostname keywords identifying well-known mail providers (first match wins)
+SMTP_PROVIDERS = {
+    'Google': ('google', 'gmail', 'googlemail'),
+    'Microsoft': ('outlook', 'hotmail', 'microsoft'),
+    'Yahoo': ('yahoo',),
+    'ProtonMail': ('proton',),
+    'Zoho': ('zoho',),
+    'Amazon SES': ('amazonses',),
+    'Mailgun': ('mailgun',),
+    'SendGrid': ('sendgrid',),
+    'GoDaddy': ('secureserver', 'godaddy'),
+    'Rackspace': ('emailsrvr', 'rackspace'),
+    'Office 365': ('protection.outlook',),
+    'Yandex': ('yandex',),
+    'Mail.ru': ('mail.ru',),
+    'AOL': ('aol',),
+    'iCloud': ('icloud',),
+    'Fastmail': ('fastmail',)
+}
+
+class LRUCache(OrderedDict):
+    """Thread-safe dict that evicts its least recently used entries past maxsize"""
+    
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+        self._lock = threading.RLock()
+    
+    def __getitem__(self, key):
+        with self._lock:
+            value = super().__getitem__(key)
+            self.move_to_end(key)
+            return value
+    
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            while len(self) > self.maxsize:
+                self.popitem(last=False)
+    
+    def get(self, key, default=None):
+        with self._lock:
+            return self[key] if key in self else default
+    
+    def setdefault(self, key, default=None):
+        with self._lock:
+            if key not in self:
+                self[key] = default
+            return self[key]
+
+def _slots_to_dict(obj) -> Dict:
+    """Shallow dict of a slotted dataclass, in field order"""
+    return {name: getattr(obj, name) for name in obj.__slots__}
+
+@dataclass(slots=True)
+class General:
+    fullName: Optional[str] = None
+    gender: Optional[str] = None
+    state: str = "Unknown"
+    reason: Optional[str] = None
+    domain: Optional[str] = None
+
+@dataclass(slots=True)
+class Attributes:
+    free: bool = False
+    role: bool = False
+    disposable: bool = False
+    acceptAll: bool = False
+    tag: bool = False
+    numericalChars: int = 0
+    alphabeticalChars: int = 0
+    unicodeSymbols: int = 0
+    mailboxFull: bool = False
+    noReply: bool = False
+
+@dataclass(slots=True)
+class MailServer:
+    smtpProvider: Optional[str] = None
+    mxRecord: Optional[str] = None
+    implicitMXRecord: Optional[str] = None
+
+@dataclass(slots=True)
+class Details:
+    general: General = field(default_factory=General)
+    attributes: Attributes = field(default_factory=Attributes)
+    mailServer: MailServer = field(default_factory=MailServer)
+
+@dataclass(slots=True)
+class EmailResult:
+    """Validation result for one email; field names match the JSON output"""
+    email: str
+    isValid: bool = False
+    riskLevel: str = "high"
+    deliverabilityScore: int = 0
+    _id: Optional[str] = None
+    details: Details = field(default_factory=Details)
+    
+    def to_dict(self) -> Dict:
+        """Convert to the nested dict written to JSON"""
+        # Built straight from the slots: dataclasses.asdict deep-copies every
+        # value and is several times slower for these flat records
+        details = self.details
+        return {
+            'email': self.email,
+            'isValid': self.isValid,
+            'riskLevel': self.riskLevel,
+            'deliverabilityScore': self.deliverabilityScore,
+            '_id': self._id,
+            'details': {
+                'general': _slots_to_dict(details.general),
+                'attributes': _slots_to_dict(details.attributes),
+                'mailServer': _slots_to_dict(details.mailServer)
+            }
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'EmailResult':
+        """Rebuild a result from its JSON dict (e.g. a Redis cache hit)"""
+        details = data.get('details') or {}
+        return cls(
+            email=data['email'],
+            isValid=data.get('isValid', False),
+            riskLevel=data.get('riskLevel', "high"),
+            deliverabilityScore=data.get('deliverabilityScore', 0),
+            _id=data.get('_id'),
+            details=Details(
+                general=General(**details.get('general', {})),
+                attributes=Attributes(**details.get('attributes', {})),
+                mailServer=MailServer(**details.get('mailServer', {}))
+            )
+        )
 
 class EmailValidator:
+    # Process-wide MX cache shared by all validator instances:
+    # domain -> (fetched_at, records)
+    _MX_CACHE: Dict[str, Tuple[float, List[str]]] = LRUCache(CACHE_SIZE_DOMAINS)
+
+    # Rejected RCPT reply code -> (state, reason, deliverability score)
+    _SMTP_CODE_TABLE = {
+        550: ("Undeliverable", "Mailbox Not Found", 0),
+        552: ("Risky", "Mailbox Full", 60),
+        421: ("Unknown", "Server Temporary Error", 30),
+        450: ("Unknown", "Server Temporary Error", 30),
+        553: ("Undeliverable", "Invalid Mailbox", 0),
+    }
+    _MAILBOX_FULL_CODES = frozenset({552})
+
     def __init__(self):
         self.local_cache = {
-            'mx': {},
-            'smtp': {},
-            'email': {}
+            'smtp': LRUCache(CACHE_SIZE_DOMAINS),
+            'email': LRUCache(CACHE_SIZE_EMAILS)
         }
+        # Idle SMTP connections per MX host: mx -> [(server, last_used, message_count)]
         self.smtp_connections = {}
+        self._smtp_lock = threading.Lock()
+        # Per-MX host connection slots: mx -> BoundedSemaphore
+        self._mx_slots = {}
+        # Domains where no MX host gave an SMTP reply: domain -> (failed_at, smtp_check)
+        self._unreachable_domains = LRUCache(CACHE_SIZE_DOMAINS)
+        # Async resolver shared by every MX prefetch, created on first use
+        self._aresolver = None
         
-    def validate_emails_batch(self, emails: List[str], max_workers: int = 20) -> List[Dict]:
+    def validate_emails_batch(self, emails: List[str], max_workers: int = MAX_WORKERS) -> List[EmailResult]:
         """Process emails in parallel, optimized by domain grouping"""
-        results = []
+        # Each distinct address is validated once; scatter the results back so
+        # every input position, repeats included, gets its result in order
+        results_by_email = {result.email: result for result in self.iter_validate_emails(emails, max_workers)}
+        return [results_by_email[email] for email in emails]
+    
+    def iter_validate_emails(self, emails: List[str], max_workers: int = MAX_WORKERS) -> Iterator[EmailResult]:
+        """Validate emails in parallel, yielding each distinct address's result as soon as it is ready"""
+        # Repeated addresses (common in scraped lists) only need validating once
+        emails = list(dict.fromkeys(emails))
         
         # First pass: Quick validation and retrieve from cache
-        quick_results = []
         remaining_emails = []
+        invalid_results = []
+        cached_results = self._get_cached_results(emails)
         
         for email in emails:
             # Try cache first
-            cached_result = self._get_cached_result(email)
+            cached_result = cached_results.get(email)
             if cached_result:
-                results.append(cached_result)
+                yield cached_result
                 continue
                 
             # Quick format validation
             quick_result = self._quick_validate(email)
-            quick_results.append(quick_result)
             
             # If format is invalid, no need for SMTP check
             if not quick_result['format_valid']:
                 final_result = self._create_result_from_quick(email, quick_result)
-                self._cache_result(email, final_result)
-                results.append(final_result)
+                invalid_results.append(final_result)
+                yield final_result
             else:
                 remaining_emails.append(email)
         
+        self._cache_results(invalid_results)
+        
         # Group remaining emails by domain for efficient processing
         domain_groups = {}
         for email in remaining_emails:
-            domain = email.split('@')[1]
+            domain = email.split('@', 1)[1].lower()
             if domain not in domain_groups:
                 domain_groups[domain] = []
             domain_groups[domain].append(email)
         
-        # Process domain groups in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_domain = {
-                executor.submit(self._process_domain_group, domain, domain_emails): domain
-                for domain, domain_emails in domain_groups.items()
-            }
+        if not domain_groups:
+            return
+        
+        # Resolve MX records for every domain up front, away from the SMTP workers
+        mx_by_domain = self._prefetch_mx_records(list(domain_groups))
+        
+        worker_count = min(max_workers, len(domain_groups))
+        
+        # Check catch-all status once per unique domain, then share it and the
+        # MX records with every shard of that domain
+        with concurrent.futures.ThreadPoolExecutor(max_workers=worker_count) as executor:
+            domain_info = dict(zip(domain_groups, executor.map(
+                self._get_domain_info, domain_groups, [mx_by_domain[domain] for domain in domain_groups]
+            )))
+        
+        # One single-threaded lane per worker. Work is routed to a lane by hashing
+        # the primary MX host, so every domain behind the same mail server lands on
+        # the same thread and keeps reusing its pooled SMTP connection
+        lanes = [concurrent.futures.ThreadPoolExecutor(max_workers=1) for _ in range(worker_count)]
+        try:
+            future_to_item = {}
+            for domain, domain_emails in domain_groups.items():
+                mx_records = domain_info[domain][0]
+                lane = self._lane_for(mx_records[0] if mx_records else domain, worker_count)
+                
+                # Split large domain groups into a few shards on neighbouring lanes so a
+                # single busy domain doesn't serialize the run, while capping connections
+                # per mail server
+                shard_count = max(1, min(MAX_WORKERS_PER_DOMAIN, len(domain_emails), worker_count))
+                for shard in range(shard_count):
+                    shard_emails = domain_emails[shard::shard_count]
+                    future = lanes[(lane + shard) % worker_count].submit(
+                        self._process_domain_group, domain, shard_emails, *domain_info[domain]
+                    )
+                    future_to_item[future] = (domain, shard_emails)
             
-            for future in concurrent.futures.as_completed(future_to_domain):
-                domain = future_to_domain[future]
+            for future in concurrent.futures.as_completed(future_to_item):
+                domain, domain_emails = future_to_item[future]
                 try:
                     domain_results = future.result()
-                    for result in domain_results:
-                        self._cache_result(result['email'], result)
-                    results.extend(domain_results)
                 except Exception as e:
-                    print(f"Error processing domain {domain}: {str(e)}")
-                    # Create error results for all emails in this domain
-                    for email in domain_groups[domain]:
-                        error_result = self._create_error_result(email, domain, str(e))
-                        self._cache_result(email, error_result)
-                        results.append(error_result)
-        
-        return results
+                    print(f"Error processing domain {domain}: {str(e)}", file=sys.stderr)
+                    # Create error results for all emails in this shard
+                    domain_results = [self._create_error_result(email, domain, str(e)) for email in domain_emails]
+                self._cache_results(domain_results)
+                yield from domain_results
+        finally:
+            for lane_executor in lanes:
+                lane_executor.shutdown(wait=True)
     
-    def _process_domain_group(self, domain: str, emails: List[str]) -> List[Dict]:
+    @staticmethod
+    def _lane_for(key: str, lane_count: int) -> int:
+        """Map an MX host or domain to a stable worker lane"""
+        return zlib.crc32(key.lower().encode()) % lane_count
+    
+    def _get_domain_info(self, domain: str, mx_records: Optional[List[str]] = None) -> Tuple[List[str], bool]:
+        """Resolve MX records and catch-all status for a domain"""
+        try:
+            if mx_records is None:
+                mx_records = self._get_mx_records(domain)
+            is_catchall = self._check_catchall(domain, mx_records) if mx_records else False
+        except Exception as e:
+            print(f"Error resolving domain {domain}: {str(e)}", file=sys.stderr)
+            return None, None
+        return mx_records, is_catchall
+    
+    def _process_domain_group(self, domain: str, emails: List[str],
+                              mx_records: List[str] = None, is_catchall: bool = None) -> List[EmailResult]:
         """Process all emails for a single domain"""
         results = []
         
-        # Get MX records once for all emails in this domain
-        mx_records = self._get_mx_records(domain)
+        # Get MX records once for all emails in this domain, unless already resolved
+        if mx_records is None:
+            mx_records = self._get_mx_records(domain)
         
         # If no MX records, all emails for this domain are invalid
         if not mx_records:
             return [self._create_invalid_domain_result(email, domain) for email in emails]
         
         # Check for catch-all
-        is_catchall = self._check_catchall(domain, mx_records)
+        if is_catchall is None:
+            is_catchall = self._check_catchall(domain, mx_records)
+        
+        # Probe every address in one pass over shared SMTP connections
+        smtp_checks = self._verify_smtp_batch(emails, domain, mx_records, is_catchall)
         
         # Process each email with the shared domain info
         for email in emails:
-            result = self._validate_email_smtp(email, domain, mx_records, is_catchall)
+            result = self._validate_email_smtp(email, domain, mx_records, is_catchall, smtp_checks[email])
             results.append(result)
             
         return results
@@ -119,8 +447,8 @@ class EmailValidator:
                 'domain': None
             }
             
-        # Split email into local part and domain
-        local_part, domain = email.split('@', 1)
+        # Domain is everything after the first @
+        domain = email.split('@', 1)[1]
         
         # Check format
         format_valid = self._validate_format(email)
@@ -131,201 +459,298 @@ class EmailValidator:
             'domain': domain
         }
     
-    def _validate_email_smtp(self, email: str, domain: str, mx_records: List[str], is_catchall: bool) -> Dict:
+    def _validate_email_smtp(self, email: str, domain: str, mx_records: List[str], is_catchall: bool,
+                             smtp_check: Optional[Dict] = None) -> EmailResult:
         """Complete validation including SMTP checks"""
-        result = {
-            "email": email,
-            "isValid": False,
-            "riskLevel": "high",
-            "deliverabilityScore": 0,
-            "_id": None,
-            "details": {
-                "general": {
-                    "fullName": None,
-                    "gender": None,
-                    "state": "Unknown",
-                    "reason": None,
-                    "domain": domain
-                },
-                "attributes": {
-                    "free": self._is_free_email(domain),
-                    "role": self._is_role_account(email.split('@')[0]),
-                    "disposable": self._is_disposable_domain(domain),
-                    "acceptAll": is_catchall,
-                    "tag": '+' in email.split('@')[0],
-                    "numericalChars": sum(c.isdigit() for c in email.split('@')[0]),
-                    "alphabeticalChars": sum(c.isalpha() for c in email.split('@')[0]),
-                    "unicodeSymbols": sum(not c.isalnum() for c in email.split('@')[0]),
-                    "mailboxFull": False,
-                    "noReply": email.lower().startswith(('noreply', 'no-reply'))
-                },
-                "mailServer": {
-                    "smtpProvider": self._identify_smtp_provider(mx_records[0]),
-                    "mxRecord": mx_records[0],
-                    "implicitMXRecord": None
-                }
-            }
-        }
+        # SMTP Verification, unless it was already done as part of a batch
+        if smtp_check is None:
+            smtp_check = self._verify_smtp(email, domain, mx_records, is_catchall)
+        
+        local_part = email.split('@', 1)[0]
+        local_lower = local_part.lower()
+        numerical_chars, alphabetical_chars, unicode_symbols = self._count_chars(local_part)
+        free, disposable = self._classify_domain(domain)
         
-        # SMTP Verification
-        smtp_check = self._verify_smtp(email, domain, mx_records, is_catchall)
+        result = EmailResult(
+            email=email,
+            details=Details(
+                general=General(domain=domain),
+                attributes=Attributes(
+                    free=free,
+                    role=self._is_role_account(local_part),
+                    disposable=disposable,
+                    acceptAll=is_catchall,
+                    tag='+' in local_part,
+                    numericalChars=numerical_chars,
+                    alphabeticalChars=alphabetical_chars,
+                    unicodeSymbols=unicode_symbols,
+                    noReply=local_lower.startswith(NO_REPLY_PREFIXES)
+                ),
+                mailServer=MailServer(
+                    # Identified once per domain batch by the SMTP check
+                    smtpProvider=smtp_check["smtp_provider"],
+                    mxRecord=mx_records[0]
+                )
+            )
+        )
+        general = result.details.general
         
         # Determine state based on SMTP result
         if smtp_check["exists"]:
             if is_catchall:
-                result["details"]["general"]["state"] = "Risky"
-                result["details"]["general"]["reason"] = "Catch-all Domain"
-                result["deliverabilityScore"] = 70
-                result["riskLevel"] = "medium"
+                general.state = "Risky"
+                general.reason = "Catch-all Domain"
+                result.deliverabilityScore = 70
+                result.riskLevel = "medium"
+            elif smtp_check.get("unverifiable"):
+                general.state = "Risky"
+                general.reason = "Unverifiable Provider"
+                result.deliverabilityScore = 70
+                result.riskLevel = "medium"
             else:
-                result["details"]["general"]["state"] = "Deliverable"
-                result["details"]["general"]["reason"] = "Valid Email"
-                result["deliverabilityScore"] = 90
-                result["riskLevel"] = "low"
-                result["isValid"] = True
+                general.state = "Deliverable"
+                general.reason = "Valid Email"
+                result.deliverabilityScore = 90
+                result.riskLevel = "low"
+                result.isValid = True
         else:
-            if smtp_check["smtp_code"] == 550:
-                result["details"]["general"]["state"] = "Undeliverable"
-                result["details"]["general"]["reason"] = "Mailbox Not Found"
-            elif smtp_check["smtp_code"] == 552:
-                result["details"]["general"]["state"] = "Risky"
-                result["details"]["general"]["reason"] = "Mailbox Full"
-                result["details"]["attributes"]["mailboxFull"] = True
-                result["deliverabilityScore"] = 60
-            elif smtp_check["smtp_code"] in [421, 450]:
-                result["details"]["general"]["state"] = "Unknown"
-                result["details"]["general"]["reason"] = "Server Temporary Error"
-                result["deliverabilityScore"] = 30
-            elif smtp_check["smtp_code"] == 553:
-                result["details"]["general"]["state"] = "Undeliverable"
-                result["details"]["general"]["reason"] = "Invalid Mailbox"
-            else:
-                result["details"]["general"]["state"] = "Unknown"
-                result["details"]["general"]["reason"] = smtp_check["smtp_response"] or "Unknown Error"
+            general.state, general.reason, result.deliverabilityScore = self._SMTP_CODE_TABLE.get(
+                smtp_check["smtp_code"],
+                ("Unknown", smtp_check["smtp_response"] or "Unknown Error", 0)
+            )
+            result.details.attributes.mailboxFull = smtp_check["smtp_code"] in self._MAILBOX_FULL_CODES
         
         # Additional risk factors
-        if result["details"]["attributes"]["disposable"]:
-            result["deliverabilityScore"] = max(result["deliverabilityScore"] - 20, 0)
+        if result.details.attributes.disposable:
+            result.deliverabilityScore = max(result.deliverabilityScore - 20, 0)
         
-        if result["details"]["attributes"]["role"]:
-            result["deliverabilityScore"] = max(result["deliverabilityScore"] - 10, 0)
+        if result.details.attributes.role:
+            result.deliverabilityScore = max(result.deliverabilityScore - 10, 0)
             
         # Final risk level based on score
-        if result["deliverabilityScore"] >= 90:
-            result["riskLevel"] = "low"
-        elif result["deliverabilityScore"] >= 70:
-            result["riskLevel"] = "medium"
+        if result.deliverabilityScore >= 90:
+            result.riskLevel = "low"
+        elif result.deliverabilityScore >= 70:
+            result.riskLevel = "medium"
         else:
-            result["riskLevel"] = "high"
+            result.riskLevel = "high"
             
         return result
     
-    def _get_cached_result(self, email: str) -> Dict:
-        """Get cached result from Redis or local cache"""
+    def _get_cached_results(self, emails: List[str]) -> Dict[str, EmailResult]:
+        """Get cached results from local cache, then Redis in one MGET per chunk"""
         # Try local cache first
-        if email in self.local_cache['email']:
-            return self.local_cache['email'][email]
-            
+        local = self.local_cache['email']
+        results = {}
+        for email in emails:
+            result = local.get(email)
+            if result:
+                results[email] = result
+        
         # Try Redis if available
-        if REDIS_AVAILABLE:
+        missing = [email for email in emails if email not in results]
+        if REDIS_AVAILABLE and missing:
             try:
-                cached = redis_client.get(f"email:{email}")
-                if cached:
-                    result = json.loads(cached)
-                    # Also store in local cache
-                    self.local_cache['email'][email] = result
-                    return result
+                for start in range(0, len(missing), REDIS_BATCH_SIZE):
+                    chunk = missing[start:start + REDIS_BATCH_SIZE]
+                    for email, cached in zip(chunk, redis_client.mget([f"email:{email}" for email in chunk])):
+                        if cached:
+                            result = EmailResult.from_dict(_json_loads(cached))
+                            # Also store in local cache
+                            local[email] = result
+                            results[email] = result
             except:
                 pass
                 
-        return None
+        return results
     
-    def _cache_result(self, email: str, result: Dict) -> None:
-        """Cache result in Redis and local cache"""
+    def _cache_results(self, results: List[EmailResult]) -> None:
+        """Cache results in local cache, and in Redis with one pipelined round trip"""
+        if not results:
+            return
+        
         # Store in local cache
-        self.local_cache['email'][email] = result
+        for result in results:
+            self.local_cache['email'][result.email] = result
         
         # Store in Redis if available
         if REDIS_AVAILABLE:
             try:
-                redis_client.setex(f"email:{email}", CACHE_TTL_EMAIL, json.dumps(result))
+                pipe = redis_client.pipeline(transaction=False)
+                for result in results:
+                    pipe.setex(f"email:{result.email}", CACHE_TTL_EMAIL, _json_encode(result))
+                pipe.execute()
             except:
                 pass
     
-    def _get_mx_records(self, domain: str) -> List[str]:
-        """Get MX records with caching"""
-        # Try local cache first
-        if domain in self.local_cache['mx']:
-            return self.local_cache['mx'][domain]
+    def _get_local_mx_records(self, domain: str) -> Optional[List[str]]:
+        """Get MX records from the process-wide cache if they are still fresh"""
+        cached_entry = self._MX_CACHE.get(domain)
+        if cached_entry and time.monotonic() - cached_entry[0] < CACHE_TTL_MX_LOCAL:
+            return cached_entry[1]
+        return None
+    
+    def _get_cached_mx_records(self, domain: str) -> Optional[List[str]]:
+        """Get MX records from the process-wide cache or Redis"""
+        # Try process-wide cache first
+        records = self._get_local_mx_records(domain)
+        if records is not None:
+            return records
             
         # Try Redis cache
         if REDIS_AVAILABLE:
             try:
                 cached = redis_client.get(f"mx:{domain}")
                 if cached:
-                    records = json.loads(cached)
-                    self.local_cache['mx'][domain] = records
+                    records = self._decode_mx_records(cached)
+                    self._MX_CACHE[domain] = (time.monotonic(), records)
                     return records
             except:
                 pass
         
+        return None
+    
+    @staticmethod
+    def _decode_mx_records(cached: bytes) -> List[str]:
+        """Decode a Redis MX entry: newline-separated hosts, or a JSON list from older entries"""
+        if cached.startswith(b'['):
+            return _json_loads(cached)
+        return cached.decode().split('\n')
+    
+    def _store_mx_records(self, domain: str, records: List[str]) -> None:
+        """Cache MX records locally, and in Redis when there are any"""
+        self._MX_CACHE[domain] = (time.monotonic(), records)
+        if records and REDIS_AVAILABLE:
+            try:
+                redis_client.setex(f"mx:{domain}", CACHE_TTL_MX, '\n'.join(records).encode())
+            except:
+                pass
+    
+    def _get_mx_records(self, domain: str) -> List[str]:
+        """Get MX records with caching"""
+        domain = domain.lower()
+        
+        cached = self._get_cached_mx_records(domain)
+        if cached is not None:
+            return cached
+        
         # Fetch from DNS
         try:
             mx_records = dns.resolver.resolve(domain, 'MX')
             records = [str(mx.exchange).rstrip('.') for mx in mx_records]
-            
-            # Cache the result
-            self.local_cache['mx'][domain] = records
-            if REDIS_AVAILABLE:
-                try:
-                    redis_client.setex(f"mx:{domain}", CACHE_TTL_MX, json.dumps(records))
-                except:
-                    pass
-                    
+            self._store_mx_records(domain, records)
             return records
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            # Definitive negative answer, remember it so dead domains aren't re-queried
+            self._store_mx_records(domain, [])
+            return []
         except:
-            self.local_cache['mx'][domain] = []
             return []
     
+    def _prefetch_mx_records(self, domains: List[str]) -> Dict[str, List[str]]:
+        """Resolve MX records for all domains before any SMTP work starts"""
+        missing = [domain for domain in domains if self._get_local_mx_records(domain) is None]
+        
+        # Load whatever Redis already has in one MGET
+        if REDIS_AVAILABLE and missing:
+            try:
+                cached = redis_client.mget([f"mx:{domain}" for domain in missing])
+                fetched_at = time.monotonic()
+                for domain, records in zip(missing, cached):
+                    if records:
+                        self._MX_CACHE[domain] = (fetched_at, self._decode_mx_records(records))
+                missing = [domain for domain, records in zip(missing, cached) if not records]
+            except:
+                pass
+        
+        # Resolve every remaining domain concurrently on one event loop
+        if missing:
+            try:
+                # uvloop is optional; use it for the resolver loop when installed
+                run = uvloop.run if uvloop else asyncio.run
+                run(self._resolve_mx_batch(missing))
+            except Exception as e:
+                print(f"Error prefetching MX records: {str(e)}", file=sys.stderr)
+        
+        mx_by_domain = {domain: self._get_local_mx_records(domain) for domain in domains}
+        
+        # Retry whatever the async pass couldn't answer on a small dedicated DNS pool,
+        # so slow lookups never tie up the SMTP workers
+        unresolved = [domain for domain, records in mx_by_domain.items() if records is None]
+        if unresolved:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(DNS_MAX_WORKERS, len(unresolved))) as dns_executor:
+                mx_by_domain.update(zip(unresolved, dns_executor.map(self._get_mx_records, unresolved)))
+        
+        return mx_by_domain
+    
+    async def _resolve_mx_batch(self, domains: List[str]) -> None:
+        """Resolve MX records for many domains at once and cache the answers"""
+        # Reading resolv.conf once is enough for the life of the validator
+        if self._aresolver is None:
+            self._aresolver = dns.asyncresolver.Resolver()
+        answers = await asyncio.gather(
+            *[self._aresolver.resolve(domain, 'MX') for domain in domains],
+            return_exceptions=True
+        )
+        
+        for domain, answer in zip(domains, answers):
+            if isinstance(answer, (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)):
+                self._store_mx_records(domain, [])
+            elif not isinstance(answer, Exception):
+                self._store_mx_records(domain, [str(mx.exchange).rstrip('.') for mx in answer])
+    
     def _check_catchall(self, domain: str, mx_records: List[str]) -> bool:
         """Check if domain has catch-all enabled"""
+        # Free mail providers aren't probed over SMTP at all
+        if SKIP_SMTP_FOR_FREE_PROVIDERS and self._is_free_email(domain):
+            return False
+        
         # Try cache first
         cache_key = f"catchall:{domain}"
+        failed_key = f"catchall_probe_failed:{domain}"
         
-        if domain in self.local_cache['smtp'] and 'is_catchall' in self.local_cache['smtp'][domain]:
-            return self.local_cache['smtp'][domain]['is_catchall']
+        domain_cache = self.local_cache['smtp'].get(domain)
+        if domain_cache:
+            if 'is_catchall' in domain_cache:
+                return domain_cache['is_catchall']
+            # No MX host answered the last probe, don't pay its timeouts again yet
+            if time.monotonic() - domain_cache.get('probe_failed_at', float('-inf')) < CATCHALL_PROBE_RETRY_TTL:
+                return False
             
         if REDIS_AVAILABLE:
             try:
-                cached = redis_client.get(cache_key)
+                cached, probe_failed = redis_client.mget([cache_key, failed_key])
                 if cached:
                     is_catchall = cached == b'1'
-                    if domain not in self.local_cache['smtp']:
-                        self.local_cache['smtp'][domain] = {}
-                    self.local_cache['smtp'][domain]['is_catchall'] = is_catchall
+                    self.local_cache['smtp'].setdefault(domain, {})['is_catchall'] = is_catchall
                     return is_catchall
+                if probe_failed:
+                    self.local_cache['smtp'].setdefault(domain, {})['probe_failed_at'] = time.monotonic()
+                    return False
             except:
                 pass
         
-        # Test with a random non-existent email
-        random_email = f"nonexistent_{hash(domain)}@{domain}"
+        # Test with a random non-existent email, reusing the same address for
+        # every probe against this domain
+        domain_cache = self.local_cache['smtp'].setdefault(domain, {})
+        if 'probe_address' not in domain_cache:
+            domain_cache['probe_address'] = f"zzzz-noexist-{secrets.token_hex(12)}@{domain}"
+        random_email = domain_cache['probe_address']
         
         try:
             for mx_record in mx_records:
                 try:
-                    server = smtplib.SMTP(timeout=5)
-                    server.connect(mx_record, 25)
-                    server.helo('example.com')
-                    server.mail('noreply@example.com')
-                    code, _ = server.rcpt(str(random_email))
-                    server.quit()
+                    code, _ = self._smtp_rcpt(mx_record, random_email)
+                    
+                    # A temporary failure (often greylisting of a new sender) says
+                    # nothing about catch-all; retry later instead of caching a verdict
+                    if code in SMTP_TRANSIENT_CODES:
+                        break
                     
-                    is_catchall = (code == 250)
+                    is_catchall = code in SMTP_ACCEPT_CODES
                     
                     # Cache the result
-                    if domain not in self.local_cache['smtp']:
-                        self.local_cache['smtp'][domain] = {}
-                    self.local_cache['smtp'][domain]['is_catchall'] = is_catchall
+                    domain_cache['is_catchall'] = is_catchall
                     
                     if REDIS_AVAILABLE:
                         try:
@@ -338,11 +763,24 @@ class EmailValidator:
                     continue
         except:
             pass
+        
+        # No MX host gave a definitive answer; remember that for a while rather
+        # than treating it as "not catch-all"
+        domain_cache['probe_failed_at'] = time.monotonic()
+        if REDIS_AVAILABLE:
+            try:
+                redis_client.setex(failed_key, CATCHALL_PROBE_RETRY_TTL, '1')
+            except:
+                pass
             
         return False
         
     def _verify_smtp(self, email: str, domain: str, mx_records: List[str], is_catchall: bool) -> Dict:
         """Verify email using SMTP"""
+        return self._verify_smtp_batch([email], domain, mx_records, is_catchall)[email]
+    
+    def _verify_smtp_batch(self, emails: List[str], domain: str, mx_records: List[str], is_catchall: bool) -> Dict[str, Dict]:
+        """Verify all emails for one domain using SMTP, sharing connections and transactions"""
         result = {
             "exists": False,
             "smtp_code": None,
@@ -355,231 +793,383 @@ class EmailValidator:
             result["exists"] = True
             result["smtp_code"] = 250
             result["smtp_response"] = "Catch-all domain"
-            return result
+            return {email: dict(result) for email in emails}
+        
+        # Free mail providers don't give a meaningful answer, skip the round-trip
+        if SKIP_SMTP_FOR_FREE_PROVIDERS and self._is_free_email(domain):
+            result["exists"] = True
+            result["unverifiable"] = True
+            result["smtp_code"] = 250
+            result["smtp_response"] = "Provider does not support verification"
+            return {email: dict(result) for email in emails}
+        
+        # Every MX host for this domain failed recently, don't wait on them again
+        unreachable = self._unreachable_domains.get(domain)
+        if unreachable and time.monotonic() - unreachable[0] < SMTP_UNREACHABLE_TTL:
+            return {email: dict(unreachable[1]) for email in emails}
             
-        # Check SMTP
+        # Check SMTP, giving up on backup MX hosts once the deadline has passed
+        # without any new replies. Emails left with only a non-definitive reply
+        # (e.g. a 4xx from a greylisting or overloaded host) are asked of the
+        # next MX host; the last such reply is kept if none gives a verdict.
+        replies = {}
+        tentative_replies = {}
+        deadline = time.monotonic() + SMTP_EMAIL_DEADLINE
         for mx_record in mx_records:
+            pending = [email for email in emails if email not in replies]
+            if not pending:
+                break
+            if time.monotonic() >= deadline:
+                result["smtp_response"] = result["smtp_response"] or "Verification deadline exceeded"
+                break
+            mx_replies = {}
             try:
-                # Connect and verify
-                server = smtplib.SMTP(timeout=5)
-                server.connect(mx_record, 25)
-                server.helo('example.com')
-                server.mail('noreply@example.com')
-                code, message = server.rcpt(str(email))
-                server.quit()
-                
-                # Store result
-                result["smtp_code"] = code
-                result["smtp_response"] = str(message, 'utf-8') if isinstance(message, bytes) else str(message)
-                
-                if code == 250:
-                    result["exists"] = True
-                
-                # Stop if we got a definitive answer
-                if code in [250, 550, 551, 553]:
-                    break
+                # Verify over pooled connections; the first reachable MX answers for
+                # the domain, backup MX hosts almost always give the same reply
+                self._smtp_rcpt_batch(mx_record, pending, mx_replies)
             except smtplib.SMTPServerDisconnected:
                 result["smtp_response"] = "Server disconnected"
-                continue
             except smtplib.SMTPConnectError:
                 result["smtp_response"] = "Connection error"
-                continue
             except socket.timeout:
                 result["smtp_response"] = "Connection timeout"
-                continue
             except Exception as e:
                 result["smtp_response"] = f"Error: {str(e)}"
-                continue
+            for email, reply in mx_replies.items():
+                if reply[0] in SMTP_DEFINITIVE_CODES:
+                    replies[email] = reply
+                    tentative_replies.pop(email, None)
+                else:
+                    tentative_replies[email] = reply
+            if mx_replies:
+                deadline = time.monotonic() + SMTP_EMAIL_DEADLINE
+        
+        # No server replied at all, so the outcome is the same for any mailbox here
+        if emails and not replies and not tentative_replies:
+            self._unreachable_domains[domain] = (time.monotonic(), dict(result))
+        replies.update(tentative_replies)
+        
+        checks = {}
+        for email in emails:
+            check = dict(result)
+            if email in replies:
+                code, message = replies[email]
+                check["smtp_code"] = code
+                check["smtp_response"] = str(message, 'utf-8') if isinstance(message, bytes) else str(message)
+                check["exists"] = code in SMTP_ACCEPT_CODES
+            checks[email] = check
                 
-        return result
+        return checks
+    
+    def _acquire_smtp(self, mx_record: str) -> Tuple[smtplib.SMTP, int]:
+        """Take an idle pooled connection to the MX host or open a new one"""
+        stale = []
+        pooled = None
+        with self._smtp_lock:
+            idle = self.smtp_connections.get(mx_record, [])
+            while idle:
+                server, last_used, message_count = idle.pop()
+                if time.monotonic() - last_used < SMTP_MAX_IDLE_SECONDS and self._is_smtp_alive(server):
+                    pooled = (server, message_count)
+                    break
+                stale.append(server)
+        
+        for server in stale:
+            self._close_smtp(server)
+        if pooled:
+            return pooled
+        
+        server = smtplib.SMTP(local_hostname='example.com', timeout=SMTP_TIMEOUT)
+        server.connect(mx_record, 25)
+        # EHLO so we learn about PIPELINING, falling back to HELO for old servers
+        server.ehlo_or_helo_if_needed()
+        return server, 0
+    
+    @staticmethod
+    def _is_smtp_alive(server: smtplib.SMTP) -> bool:
+        """Check that an idle connection hasn't been closed by the server"""
+        sock = server.sock
+        if sock is None:
+            return False
+        # An idle SMTP session has nothing to read; EOF or stray data (e.g. a 421
+        # timeout notice) means the server is done with us
+        try:
+            sock.setblocking(False)
+            try:
+                return not sock.recv(1, socket.MSG_PEEK)
+            except BlockingIOError:
+                return True
+            finally:
+                sock.settimeout(SMTP_TIMEOUT)
+        except OSError:
+            return False
+    
+    def _release_smtp(self, mx_record: str, server: smtplib.SMTP, message_count: int) -> None:
+        """Return a connection to the pool, or close it once it has been used enough"""
+        if message_count >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+            self._close_smtp(server)
+            return
+        with self._smtp_lock:
+            self.smtp_connections.setdefault(mx_record, []).append((server, time.monotonic(), message_count))
+    
+    def _close_smtp(self, server: smtplib.SMTP) -> None:
+        """Politely close an SMTP connection, ignoring errors"""
+        try:
+            server.quit()
+        except:
+            server.close()
+    
+    def close_smtp_connections(self) -> None:
+        """Close all pooled SMTP connections"""
+        with self._smtp_lock:
+            pooled = [entry[0] for idle in self.smtp_connections.values() for entry in idle]
+            self.smtp_connections = {}
+        for server in pooled:
+            self._close_smtp(server)
+    
+    def _get_mx_slots(self, mx_record: str) -> threading.BoundedSemaphore:
+        """Get the semaphore limiting concurrent connections to an MX host"""
+        with self._smtp_lock:
+            if mx_record not in self._mx_slots:
+                self._mx_slots[mx_record] = threading.BoundedSemaphore(MAX_CONNECTIONS_PER_MX)
+            return self._mx_slots[mx_record]
+    
+    def _smtp_rcpt(self, mx_record: str, address: str) -> Tuple[int, bytes]:
+        """Run a MAIL FROM / RCPT TO transaction on a pooled connection"""
+        replies = {}
+        self._smtp_rcpt_batch(mx_record, [address], replies)
+        return replies[address]
+    
+    def _smtp_rcpt_batch(self, mx_record: str, addresses: List[str], replies: Dict[str, Tuple[int, bytes]]) -> None:
+        """Probe addresses with one MAIL FROM and many RCPT TO per transaction, recording replies as they arrive"""
+        with self._get_mx_slots(mx_record):
+            retried = False
+            pending = [address for address in addresses if address not in replies]
+            while pending:
+                server, message_count = self._acquire_smtp(mx_record)
+                # Keep well under the 100 recipients servers must accept per
+                # transaction, and recycle connections after enough recipients
+                chunk = pending[:max(1, min(SMTP_MAX_RECIPIENTS_PER_TRANSACTION,
+                                            SMTP_MAX_MESSAGES_PER_CONNECTION - message_count))]
+                try:
+                    if server.has_extn('pipelining'):
+                        self._pipelined_rcpt(server, chunk, replies, reset=bool(message_count))
+                    else:
+                        if message_count:
+                            server.rset()
+                        mail_reply = server.mail('noreply@example.com')
+                        for address in chunk:
+                            # No point asking about recipients once the sender is refused
+                            replies[address] = server.rcpt(address) if mail_reply[0] == 250 else mail_reply
+                except smtplib.SMTPServerDisconnected:
+                    # Pooled connection was dropped by the server (some treat RSET
+                    # as QUIT), reconnect once and carry on with what's left
+                    server.close()
+                    if retried or not message_count:
+                        raise
+                    retried = True
+                    pending = [address for address in pending if address not in replies]
+                    continue
+                except:
+                    server.close()
+                    raise
+                
+                self._release_smtp(mx_record, server, message_count + len(chunk))
+                retried = False
+                pending = pending[len(chunk):]
+    
+    def _pipelined_rcpt(self, server: smtplib.SMTP, addresses: List[str],
+                        replies: Dict[str, Tuple[int, bytes]], reset: bool) -> None:
+        """Send RSET / MAIL FROM / RCPT TO for several addresses in one write (RFC 2920) and read the replies"""
+        commands = ['RSET'] if reset else []
+        commands.append('MAIL FROM:<noreply@example.com>')
+        commands.extend(f'RCPT TO:<{address}>' for address in addresses)
+        server.send(''.join(f'{command}\r\n' for command in commands))
+        
+        if reset:
+            server.getreply()
+        mail_reply = server.getreply()
+        for address in addresses:
+            # A refused MAIL FROM makes every RCPT fail with "bad sequence";
+            # report the refusal itself, which says why
+            rcpt_reply = server.getreply()
+            replies[address] = rcpt_reply if mail_reply[0] == 250 else mail_reply
     
     def _validate_format(self, email: str) -> bool:
         """Validate email format using regex"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        # Reject the obvious junk with C-level string checks before running the
+        # regex; the pattern only ever accepts ASCII with exactly one @
+        if len(email) > MAX_EMAIL_LENGTH or not email.isascii() or email.count('@') != 1:
+            return False
+        return EMAIL_FORMAT_RE.fullmatch(email) is not None
     
-    def _create_result_from_quick(self, email: str, quick_result: Dict) -> Dict:
+    def _create_result_from_quick(self, email: str, quick_result: Dict) -> EmailResult:
         """Create a full result from quick validation"""
         domain = quick_result.get('domain')
+        free, disposable = self._classify_domain(domain)
         
-        result = {
-            "email": email,
-            "isValid": False,
-            "riskLevel": "high",
-            "deliverabilityScore": 0,
-            "_id": None,
-            "details": {
-                "general": {
-                    "fullName": None,
-                    "gender": None,
-                    "state": "Undeliverable",
-                    "reason": "Invalid Email Format",
-                    "domain": domain
-                },
-                "attributes": {
-                    "free": domain and self._is_free_email(domain) or False,
-                    "role": False,
-                    "disposable": domain and self._is_disposable_domain(domain) or False,
-                    "acceptAll": False,
-                    "tag": False,
-                    "numericalChars": 0,
-                    "alphabeticalChars": 0,
-                    "unicodeSymbols": 0,
-                    "mailboxFull": False,
-                    "noReply": False
-                },
-                "mailServer": {
-                    "smtpProvider": None,
-                    "mxRecord": None,
-                    "implicitMXRecord": None
-                }
-            }
-        }
-        
-        return result
+        return EmailResult(
+            email=email,
+            details=Details(
+                general=General(
+                    state="Undeliverable",
+                    reason="Invalid Email Format",
+                    domain=domain
+                ),
+                attributes=Attributes(
+                    free=free,
+                    disposable=disposable
+                )
+            )
+        )
     
-    def _create_invalid_domain_result(self, email: str, domain: str) -> Dict:
+    def _create_invalid_domain_result(self, email: str, domain: str) -> EmailResult:
         """Create result for invalid domain"""
-        result = {
-            "email": email,
-            "isValid": False,
-            "riskLevel": "high",
-            "deliverabilityScore": 0,
-            "_id": None,
-            "details": {
-                "general": {
-                    "fullName": None,
-                    "gender": None,
-                    "state": "Undeliverable",
-                    "reason": "Invalid Domain",
-                    "domain": domain
-                },
-                "attributes": {
-                    "free": self._is_free_email(domain),
-                    "role": self._is_role_account(email.split('@')[0]),
-                    "disposable": self._is_disposable_domain(domain),
-                    "acceptAll": False,
-                    "tag": '+' in email.split('@')[0],
-                    "numericalChars": sum(c.isdigit() for c in email.split('@')[0]),
-                    "alphabeticalChars": sum(c.isalpha() for c in email.split('@')[0]),
-                    "unicodeSymbols": sum(not c.isalnum() for c in email.split('@')[0]),
-                    "mailboxFull": False,
-                    "noReply": email.lower().startswith(('noreply', 'no-reply'))
-                },
-                "mailServer": {
-                    "smtpProvider": None,
-                    "mxRecord": None,
-                    "implicitMXRecord": None
-                }
-            }
-        }
+        local_part = email.split('@', 1)[0]
+        local_lower = local_part.lower()
+        numerical_chars, alphabetical_chars, unicode_symbols = self._count_chars(local_part)
+        free, disposable = self._classify_domain(domain)
         
-        return result
+        return EmailResult(
+            email=email,
+            details=Details(
+                general=General(
+                    state="Undeliverable",
+                    reason="Invalid Domain",
+                    domain=domain
+                ),
+                attributes=Attributes(
+                    free=free,
+                    role=self._is_role_account(local_part),
+                    disposable=disposable,
+                    tag='+' in local_part,
+                    numericalChars=numerical_chars,
+                    alphabeticalChars=alphabetical_chars,
+                    unicodeSymbols=unicode_symbols,
+                    noReply=local_lower.startswith(NO_REPLY_PREFIXES)
+                )
+            )
+        )
     
-    def _create_error_result(self, email: str, domain: str, error: str) -> Dict:
+    def _create_error_result(self, email: str, domain: str, error: str) -> EmailResult:
         """Create result for error case"""
-        result = {
-            "email": email,
-            "isValid": False,
-            "riskLevel": "high",
-            "deliverabilityScore": 0,
-            "_id": None,
-            "details": {
-                "general": {
-                    "fullName": None,
-                    "gender": None,
-                    "state": "Unknown",
-                    "reason": f"Error: {error}",
-                    "domain": domain
-                },
-                "attributes": {
-                    "free": domain and self._is_free_email(domain) or False,
-                    "role": False,
-                    "disposable": domain and self._is_disposable_domain(domain) or False,
-                    "acceptAll": False,
-                    "tag": False,
-                    "numericalChars": 0,
-                    "alphabeticalChars": 0,
-                    "unicodeSymbols": 0,
-                    "mailboxFull": False,
-                    "noReply": False
-                },
-                "mailServer": {
-                    "smtpProvider": None,
-                    "mxRecord": None,
-                    "implicitMXRecord": None
-                }
-            }
-        }
+        free, disposable = self._classify_domain(domain)
         
-        return result
+        return EmailResult(
+            email=email,
+            details=Details(
+                general=General(
+                    state="Unknown",
+                    reason=f"Error: {error}",
+                    domain=domain
+                ),
+                attributes=Attributes(
+                    free=free,
+                    disposable=disposable
+                )
+            )
+        )
     
-    def _identify_smtp_provider(self, mx_record: str) -> str:
-        """Identify email provider based on MX record"""
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def _identify_smtp_provider(mx_record: str) -> str:
+        """Identify email provider based on MX record (memoized per MX host)"""
         if not mx_record:
             return "Unknown"
             
         mx_lower = mx_record.lower()
         
-        smtp_providers = {
-            'Google': ['google', 'gmail', 'googlemail'],
-            'Microsoft': ['outlook', 'hotmail', 'microsoft'],
-            'Yahoo': ['yahoo'],
-            'ProtonMail': ['proton'],
-            'Zoho': ['zoho'],
-            'Amazon SES': ['amazonses'],
-            'Mailgun': ['mailgun'],
-            'SendGrid': ['sendgrid'],
-            'GoDaddy': ['secureserver', 'godaddy'],
-            'Rackspace': ['emailsrvr', 'rackspace'],
-            'Office 365': ['protection.outlook'],
-            'Yandex': ['yandex'],
-            'Mail.ru': ['mail.ru'],
-            'AOL': ['aol'],
-            'iCloud': ['icloud'],
-            'Fastmail': ['fastmail']
-        }
-        
-        for provider, keywords in smtp_providers.items():
+        for provider, keywords in SMTP_PROVIDERS.items():
             if any(keyword in mx_lower for keyword in keywords):
                 return provider
                 
         return 'Unknown'
     
+    def _count_chars(self, local_part: str) -> Tuple[int, int, int]:
+        """Count digits, letters and non-alphanumeric symbols in the local part"""
+        # Local parts are almost always ASCII: count by deleting each character
+        # class with bytes.translate, which stays entirely in C
+        if local_part.isascii():
+            raw = local_part.encode('ascii')
+            numerical_chars = len(raw) - len(raw.translate(None, ASCII_DIGITS))
+            alphabetical_chars = len(raw) - len(raw.translate(None, ASCII_LETTERS))
+            return numerical_chars, alphabetical_chars, len(raw) - numerical_chars - alphabetical_chars
+        
+        # map() over the str predicates runs the loops in C instead of
+        # building a Python generator per counter
+        numerical_chars = sum(map(str.isdigit, local_part))
+        alphabetical_chars = sum(map(str.isalpha, local_part))
+        unicode_symbols = len(local_part) - sum(map(str.isalnum, local_part))
+        return numerical_chars, alphabetical_chars, unicode_symbols
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _classify_domain(domain: Optional[str]) -> Tuple[bool, bool]:
+        """Return (free, disposable) for a domain (memoized, every email at it shares the answer)"""
+        if not domain:
+            return False, False
+        domain_lower = domain.lower()
+        return domain_lower in FREE_EMAIL_DOMAINS, domain_lower in DISPOSABLE_DOMAINS
+    
     def _is_free_email(self, domain: str) -> bool:
         """Check if domain is a free email provider"""
-        free_domains = {'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'aol.com', 'icloud.com', 'mail.com'}
-        return domain.lower() in free_domains
+        return domain.lower() in FREE_EMAIL_DOMAINS
     
     def _is_role_account(self, local_part: str) -> bool:
         """Check if email is a role account"""
-        role_accounts = {'admin', 'info', 'support', 'sales', 'contact', 'help', 'noreply', 'no-reply', 'webmaster'}
-        return local_part.lower() in role_accounts
+        return local_part.lower() in ROLE_ACCOUNTS
     
     def _is_disposable_domain(self, domain: str) -> bool:
         """Check if domain is a disposable email service"""
-        disposable_domains = {
-            'tempmail.com', 'temp-mail.org', 'guerrillamail.com', 'mailinator.com',
-            'trashmail.com', 'yopmail.com', 'sharklasers.com', '10minutemail.com'
-        }
-        return domain.lower() in disposable_domains
-
+        return domain.lower() in DISPOSABLE_DOMAINS
 
 def main():
+    # --jsonl streams one compact JSON object per line as results complete
+    args = [arg for arg in sys.argv[1:] if arg != '--jsonl']
+    stream_jsonl = len(args) < len(sys.argv) - 1
+    
     try:
         # Get the input and verify it's valid JSON
-        input_arg = sys.argv[1] if len(sys.argv) > 1 else '[]'
+        input_arg = args[0] if args else '[]'
         # Clean up input if necessary (for command line arguments with escaping)
         clean_input = input_arg.replace('\\\\', '\\').replace('\\"', '"')
         if clean_input.startswith("'") and clean_input.endswith("'"):
             clean_input = clean_input[1:-1]
             
-        input_emails = json.loads(clean_input)
+        input_emails = _json_loads(clean_input)
         
         validator = EmailValidator()
-        results = validator.validate_emails_batch(input_emails)
-        
-        print(json.dumps(results))
+        try:
+            if stream_jsonl:
+                for result in validator.iter_validate_emails(input_emails):
+                    sys.stdout.write(_json_dumps(result) + '\n')
+                    sys.stdout.flush()
+            else:
+                # Write the array element by element as results complete, so a
+                # huge batch never has to be serialized in one go. Repeated
+                # addresses are validated once and written once per occurrence
+                occurrences = Counter(input_emails)
+                separator = '['
+                try:
+                    for result in validator.iter_validate_emails(input_emails):
+                        element = _json_dumps(result)
+                        for _ in range(occurrences[result.email]):
+                            sys.stdout.write(separator + element)
+                            separator = ','
+                except Exception as e:
+                    # Nothing written yet: report the error object as before
+                    if separator == '[':
+                        raise
+                    # The array has started; close it so stdout stays valid
+                    # JSON, report the error on stderr and exit non-zero so
+                    # the caller doesn't take the partial array as complete
+                    sys.stdout.write(']\n')
+                    sys.stdout.flush()
+                    print(json.dumps({"error": str(e)}), file=sys.stderr)
+                    sys.exit(1)
+                sys.stdout.write('[]\n' if separator == '[' else ']\n')
+        finally:
+            validator.close_smtp_connections()
     except json.JSONDecodeError as e:
         print(json.dumps({"error": f"JSON parse error: {str(e)}, input was: {input_arg}"}))
     except Exception as e:
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from typing import Optional
+
+import aio_pika
+from aio_pika.pool import Pool
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from redis import asyncio as aioredis
+
+from ..config import settings
+from ..models.validation import EmailValidationRequest
+from ..services.cache_service import backfill_cache_indexes
+from ..services.circuit_breaker import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+# Shared Redis clients, each backed by one connection pool for the whole app.
+# The bytes client skips response decoding, for values stored compressed.
+_redis_pool: Optional[aioredis.ConnectionPool] = None
+_redis: Optional[aioredis.Redis] = None
+_redis_bytes_pool: Optional[aioredis.ConnectionPool] = None
+_redis_bytes: Optional[aioredis.Redis] = None
+
+# Shared circuit breaker, bound to the shared decoded Redis client
+_circuit_breaker: Optional[CircuitBreaker] = None
+
+def _create_redis_pool(decode_responses: bool) -> aioredis.ConnectionPool:
+    return aioredis.ConnectionPool.from_url(
+        settings.REDIS_URL,
+        password=settings.REDIS_PASSWORD,
+        db=settings.REDIS_DB,
+        decode_responses=decode_responses,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        socket_keepalive=True,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL
+    )
+
+def open_redis_pool() -> aioredis.Redis:
+    """Create the shared Redis connection pools if they don't exist yet."""
+    global _redis_pool, _redis, _redis_bytes_pool, _redis_bytes
+    if _redis is None:
+        _redis_pool = _create_redis_pool(decode_responses=True)
+        _redis = aioredis.Redis(connection_pool=_redis_pool)
+        _redis_bytes_pool = _create_redis_pool(decode_responses=False)
+        _redis_bytes = aioredis.Redis(connection_pool=_redis_bytes_pool)
+    return _redis
+
+async def close_redis_pool() -> None:
+    """Disconnect the shared Redis connection pools on application shutdown."""
+    global _redis_pool, _redis, _redis_bytes_pool, _redis_bytes, _circuit_breaker
+    for pool in (_redis_pool, _redis_bytes_pool):
+        if pool is not None:
+            await pool.disconnect()
+    _redis_pool = None
+    _redis = None
+    _redis_bytes_pool = None
+    _redis_bytes = None
+    _circuit_breaker = None
+
+async def index_existing_cache_entries() -> None:
+    """Index cache entries written before the expiry indexes, on application startup."""
+    try:
+        indexed = await backfill_cache_indexes(open_redis_pool())
+        if indexed:
+            logger.info(f"Indexed {indexed} existing cache entries")
+    except Exception as e:
+        # The backfill is retried on the next startup
+        logger.error(f"Could not index existing cache entries on startup: {str(e)}")
+
+# Redis client dependency
+async def get_redis() -> aioredis.Redis:
+    return open_redis_pool()
+
+# Redis client dependency returning raw bytes
+async def get_redis_bytes() -> aioredis.Redis:
+    open_redis_pool()
+    return _redis_bytes
+
+# Shared RabbitMQ connection, opened at startup and reused by every request.
+# Publishing goes through a small pool of channels so that independent
+# batches are not serialized on a single channel.
+_mq_connection: Optional[aio_pika.abc.AbstractRobustConnection] = None
+_mq_channel_pool: Optional[Pool] = None
+_mq_lock = asyncio.Lock()
+
+async def get_mq_channel_pool() -> Pool:
+    """Return the shared channel pool, (re)opening the connection if needed."""
+    global _mq_connection, _mq_channel_pool
+    async with _mq_lock:
+        if _mq_connection is None or _mq_connection.is_closed:
+            _mq_connection = await aio_pika.connect_robust(
+                host=settings.RABBITMQ_HOST,
+                port=settings.RABBITMQ_PORT,
+                login=settings.RABBITMQ_USER,
+                password=settings.RABBITMQ_PASS,
+                virtualhost=settings.RABBITMQ_VHOST
+            )
+            _mq_channel_pool = None
+        if _mq_channel_pool is None:
+            # Batch progress is tracked in Redis, so by default publishes do not
+            # wait for broker confirms; messages stay persistent on the durable
+            # queue. Concurrent publishes overlap their confirms when enabled.
+            connection = _mq_connection
+            _mq_channel_pool = Pool(
+                lambda: connection.channel(publisher_confirms=settings.RABBITMQ_PUBLISHER_CONFIRMS),
+                max_size=settings.RABBITMQ_CHANNEL_POOL_SIZE
+            )
+        return _mq_channel_pool
+
+async def open_mq_connection() -> None:
+    """Open the shared RabbitMQ connection on application startup."""
+    try:
+        await get_mq_channel_pool()
+    except Exception as e:
+        # Requests retry the connection lazily, so the API can still start
+        logger.error(f"Could not connect to RabbitMQ on startup: {str(e)}")
+
+async def close_mq_connection() -> None:
+    """Close the shared RabbitMQ connection on application shutdown."""
+    global _mq_connection, _mq_channel_pool
+    async with _mq_lock:
+        if _mq_channel_pool is not None:
+            await _mq_channel_pool.close()
+        if _mq_connection is not None and not _mq_connection.is_closed:
+            await _mq_connection.close()
+        _mq_connection = None
+        _mq_channel_pool = None
+
+# Circuit breaker dependency. Every request shares one instance, so the
+# breaker's short-lived status cache is reused across requests.
+async def get_circuit_breaker() -> CircuitBreaker:
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        _circuit_breaker = CircuitBreaker(open_redis_pool())
+    return _circuit_breaker
+
+# Batch request body dependency. Parsing the raw body with pydantic's JSON
+# parser validates it in one pass, instead of decoding it with the json module
+# first and validating the resulting Python objects afterwards.
+async def parse_validation_request(request: Request) -> EmailValidationRequest:
+    try:
+        return EmailValidationRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors()]
+        )
+
+# OpenAPI description of the body read by parse_validation_request
+VALIDATION_REQUEST_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": EmailValidationRequest.model_json_schema()}
+        }
+    }
+}
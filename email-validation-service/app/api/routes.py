@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Request
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Request, Query
 from ..models.validation import (
     EmailValidationResult, 
     EmailValidationRequest, 
@@ -12,56 +12,199 @@ from ..models.validation import (
 from ..services.validator import EmailValidator
 from ..services.dns_validator import DNSValidator
 from ..services.circuit_breaker import CircuitBreaker
-from ..utils.batch_utils import split_into_batches, create_batch_tracking, queue_batch_for_processing, get_multi_batch_status
+from ..services.cache_service import CACHE_INDEX_KEYS
+from ..utils.batch_utils import split_into_batches, create_batch_tracking, queue_batch_for_processing, get_multi_batch_status, new_batch_id, dedupe_emails, decode_batch_results, mark_batches_failed
 from ..auth import RequireAuth, AuthContext
 from ..auth.rate_limiter import limiter, RATE_LIMITS
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import asyncio
 import logging
+import time
 from datetime import datetime
 from ..config import settings
-import uuid
-import json
-import aio_pika
+import orjson
 from redis import asyncio as aioredis
-import redis
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
+from .deps import get_redis, get_redis_bytes, get_circuit_breaker, get_mq_channel_pool, parse_validation_request, VALIDATION_REQUEST_OPENAPI
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-validator = EmailValidator()
-
 
 # Initialize services
+validator = EmailValidator()
 dns_validator = DNSValidator()
-email_validator = EmailValidator()
-
-# Redis client dependency
-async def get_redis():
-    redis_client = aioredis.from_url(
-        f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-        password=settings.REDIS_PASSWORD,
-        db=settings.REDIS_DB,
-        decode_responses=True
-    )
-    try:
-        yield redis_client
-    finally:
-        await redis_client.close()
-
-# Circuit breaker dependency
-async def get_circuit_breaker():
-    redis_client = redis.from_url(
-        f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-        password=settings.REDIS_PASSWORD,
-        db=settings.REDIS_DB,
-        decode_responses=True
-    )
+
+async def publish_batch(batch_id: str, emails: List[str], validation_flags_json: bytes, request_id: Optional[str] = None) -> None:
+    """Publish one batch on a channel borrowed from the shared pool."""
+    channel_pool = await get_mq_channel_pool()
+    async with channel_pool.acquire() as channel:
+        await queue_batch_for_processing(channel, batch_id, emails, validation_flags_json, request_id)
+
+async def publish_batches(
+    redis_client: aioredis.Redis,
+    request_id: str,
+    batch_ids: List[str],
+    email_batches: List[List[str]],
+    validation_flags_json: bytes
+) -> None:
+    """Publish all batches of a multi-batch request concurrently, marking failed ones in its tracking record."""
+    outcomes = await asyncio.gather(*[
+        publish_batch(batch_id, email_batch, validation_flags_json, request_id)
+        for batch_id, email_batch in zip(batch_ids, email_batches)
+    ], return_exceptions=True)
+
+    # The client already has the batch IDs, so a batch that never reached the
+    # queue is reported through status polling instead of staying "processing"
+    failed_batches = {}
+    for batch_id, email_batch, outcome in zip(batch_ids, email_batches, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Error queueing batch {batch_id} of request {request_id}: {str(outcome)}")
+            failed_batches[batch_id] = len(email_batch)
+    if failed_batches:
+        try:
+            await mark_batches_failed(redis_client, request_id, failed_batches)
+        except Exception as e:
+            logger.error(f"Error marking batches {list(failed_batches)} as failed: {str(e)}")
+
+# Short-lived per-process cache of batch status lookups, so clients polling
+# the same batch at the same moment share one Redis round trip
+_status_cache: Dict[str, Tuple[float, list]] = {}
+_status_locks: Dict[str, asyncio.Lock] = {}
+# Tasks holding or waiting on each batch's lock; the lock is dropped once none remain
+_status_lock_users: Dict[str, int] = {}
+
+async def fetch_batch_status(redis_client: aioredis.Redis, batch_id: str) -> list:
+    """Return [parent request ID, decoded results, multi-batch record] for a batch ID.
+
+    Lookups are shared for STATUS_CACHE_TTL seconds. Completed batches no
+    longer change, so their decoded results are kept for the longer
+    STATUS_CACHE_COMPLETED_TTL.
+    """
+    cached = _status_cache.get(batch_id)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    lock = _status_locks.setdefault(batch_id, asyncio.Lock())
+    _status_lock_users[batch_id] = _status_lock_users.get(batch_id, 0) + 1
     try:
-        circuit_breaker = CircuitBreaker(redis_client)
-        yield circuit_breaker
+        async with lock:
+            # Another poller may have refreshed the entry while we waited
+            cached = _status_cache.get(batch_id)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+            # Fetch the parent link, the batch results and a possible
+            # multi-batch record in a single round trip
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.get(f"batch_parent:{batch_id}")
+            pipe.get(f"validation_results:{batch_id}")
+            pipe.get(f"multi_batch:{batch_id}")
+            values = await pipe.execute()
+            ttl = settings.STATUS_CACHE_TTL
+            if values[1]:
+                values[1] = decode_batch_results(values[1])
+                if values[1]["isComplete"]:
+                    ttl = settings.STATUS_CACHE_COMPLETED_TTL
+
+            now = time.monotonic()
+            if len(_status_cache) >= settings.STATUS_CACHE_MAX_ENTRIES:
+                for key in [key for key, (expires, _) in _status_cache.items() if expires <= now]:
+                    del _status_cache[key]
+                if len(_status_cache) >= settings.STATUS_CACHE_MAX_ENTRIES:
+                    _status_cache.clear()
+            _status_cache[batch_id] = (now + ttl, values)
+            return values
     finally:
-        redis_client.close()
+        _status_lock_users[batch_id] -= 1
+        if not _status_lock_users[batch_id]:
+            del _status_lock_users[batch_id]
+            del _status_locks[batch_id]
+
+async def unlink_indexed_keys(redis_client: aioredis.Redis, index_key: str) -> int:
+    """Remove every cache entry listed in index_key, returning how many were removed.
+
+    Entries are found through the cache type's index Sorted Set with ZSCAN,
+    so the work is proportional to that type's entries rather than the whole
+    keyspace, and removed with UNLINK in fixed-size chunks so Redis frees the
+    values off its main thread.
+    """
+    removed = 0
+    chunk = []
+    async for key, _ in redis_client.zscan_iter(index_key, count=settings.CACHE_SCAN_COUNT):
+        chunk.append(key)
+        if len(chunk) >= settings.CACHE_DELETE_CHUNK_SIZE:
+            removed += await redis_client.unlink(*chunk)
+            chunk = []
+    if chunk:
+        removed += await redis_client.unlink(*chunk)
+    await redis_client.unlink(index_key)
+    return removed
+
+async def stream_cache_entries(
+    redis_client: aioredis.Redis,
+    cache_type: str,
+    index_key: str,
+    cursor: int,
+    keys: List[bytes],
+    limit: int
+):
+    """Yield a view_cache page as JSON, one ZSCAN step of entries at a time.
+
+    Only the entries of the current step are held in memory. The page ends
+    once at least limit entries were read or the index is exhausted, and the
+    ZSCAN cursor to continue from is written last as next_cursor. Expects a
+    bytes client: values go to orjson undecoded and only keys are decoded.
+    """
+    yield b'{"cache_type":' + orjson.dumps(cache_type) + b',"entries":{'
+    total_entries = 0
+    seen_keys = 0
+    while True:
+        seen_keys += len(keys)
+        if keys:
+            values = await redis_client.mget(keys)
+            chunk = []
+            expired_keys = []
+            for key, value in zip(keys, values):
+                if value is None:
+                    # Entry expired; drop it from the index
+                    expired_keys.append(key)
+                    continue
+                try:
+                    # Try to parse JSON values
+                    value = orjson.loads(value)
+                except orjson.JSONDecodeError:
+                    # If not JSON, return as is
+                    value = value.decode(errors="replace")
+                chunk.append(orjson.dumps(key.decode()) + b":" + orjson.dumps(value))
+            if expired_keys:
+                await redis_client.zrem(index_key, *expired_keys)
+            if chunk:
+                yield (b"," if total_entries else b"") + b",".join(chunk)
+                total_entries += len(chunk)
+        if cursor == 0 or seen_keys >= limit:
+            break
+        cursor, members = await redis_client.zscan(index_key, cursor=cursor, count=limit)
+        keys = [key for key, _ in members]
+    yield b'},"total_entries":' + str(total_entries).encode() + b',"next_cursor":' + str(cursor).encode() + b"}"
+
+async def validate_directly(emails: List[str], validation_flags: Dict[str, bool]) -> list:
+    """Validate emails in-process; returns a result or exception per input email."""
+    # Validate each distinct email once, concurrently; each one is
+    # dominated by DNS/SMTP waits
+    unique_emails = dedupe_emails(emails)
+    outcomes = await asyncio.gather(*[
+        validator.validate_email(email, **validation_flags)
+        for email in unique_emails
+    ], return_exceptions=True)
+
+    outcome_by_email = {}
+    for email, outcome in zip(unique_emails, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Error validating email {email}: {str(outcome)}")
+        outcome_by_email[email] = outcome
+
+    # Expand back over the input so duplicates still get a result
+    return [outcome_by_email[email] for email in emails]
 
 @router.post("/validate")
 @limiter.limit(RATE_LIMITS["single_validation"])
@@ -70,27 +213,37 @@ async def validate_email(
     validation_request: EmailValidationRequest,
     auth: AuthContext = RequireAuth
 ):
-    """Validate a single email address"""
+    """
+    Validate a single email address (the first one in the request).
+    Prefer POST /validate-batch, which takes 1..N emails per request.
+    """
     logger.info(f"Single email validation request from user: {auth.user_id}")
     
     if not validation_request.emails:
         raise HTTPException(status_code=400, detail="No emails provided")
     
-    result = await validator.validate_email(
-        validation_request.emails[0],
-        check_mx=validation_request.check_mx,
-        check_smtp=validation_request.check_smtp,
-        check_disposable=validation_request.check_disposable,
-        check_catch_all=validation_request.check_catch_all,
-        check_blacklist=validation_request.check_blacklist
-    )
+    validation_flags = {
+        "check_mx": validation_request.check_mx,
+        "check_smtp": validation_request.check_smtp,
+        "check_disposable": validation_request.check_disposable,
+        "check_catch_all": validation_request.check_catch_all,
+        "check_blacklist": validation_request.check_blacklist
+    }
+    [result] = await validate_directly(validation_request.emails[:1], validation_flags)
+    if isinstance(result, Exception):
+        raise result
     return result
 
-@router.post("/validate-batch", response_model=BatchValidationResponse | MultiBatchResponse)
+@router.post(
+    "/validate-batch",
+    response_model=BatchValidationResponse | MultiBatchResponse,
+    openapi_extra=VALIDATION_REQUEST_OPENAPI
+)
 @limiter.limit(RATE_LIMITS["batch_validation"])
 async def validate_batch(
     request: Request,
-    validation_request: EmailValidationRequest,
+    background_tasks: BackgroundTasks,
+    validation_request: EmailValidationRequest = Depends(parse_validation_request),
     redis_client: aioredis.Redis = Depends(get_redis),
     auth: AuthContext = RequireAuth
 ):
@@ -107,25 +260,20 @@ async def validate_batch(
         raise HTTPException(status_code=400, detail="No emails provided")
 
     total_emails = len(validation_request.emails)
+    validation_flags = {
+        "check_mx": validation_request.check_mx,
+        "check_smtp": validation_request.check_smtp,
+        "check_disposable": validation_request.check_disposable,
+        "check_catch_all": validation_request.check_catch_all,
+        "check_blacklist": validation_request.check_blacklist
+    }
 
     # For small batches, process directly
     if total_emails <= settings.SMALL_BATCH_THRESHOLD:
-        batch_id = str(uuid.uuid4())
-        results = []
-        for email in validation_request.emails:
-            try:
-                result = await validator.validate_email(
-                    email,
-                    check_mx=validation_request.check_mx,
-                    check_smtp=validation_request.check_smtp,
-                    check_disposable=validation_request.check_disposable,
-                    check_catch_all=validation_request.check_catch_all,
-                    check_blacklist=validation_request.check_blacklist
-                )
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Error validating email {email}: {str(e)}")
-                continue
+        batch_id = new_batch_id()
+
+        outcomes = await validate_directly(validation_request.emails, validation_flags)
+        results = [outcome for outcome in outcomes if not isinstance(outcome, Exception)]
         
         return BatchValidationResponse(
             batchId=batch_id,
@@ -135,38 +283,25 @@ async def validate_batch(
             results=results
         )
 
+    # Queue each distinct email once; totals reflect what the workers will report
+    unique_emails = dedupe_emails(validation_request.emails)
+    if len(unique_emails) < total_emails:
+        logger.info(f"Dropped {total_emails - len(unique_emails)} duplicate emails from batch request")
+    total_emails = len(unique_emails)
+
+    # Encode the validation flags once; every batch message reuses the bytes
+    validation_flags_json = orjson.dumps(validation_flags)
+
     # For larger batches, determine if we need multi-batch processing
-    email_batches = split_into_batches(validation_request.emails)
+    email_batches = split_into_batches(unique_emails)
     
     # If only one batch is needed, use the standard approach
     if len(email_batches) == 1:
-        batch_id = str(uuid.uuid4())
+        batch_id = new_batch_id()
         
         try:
-            # Connect to RabbitMQ
-            connection = await aio_pika.connect_robust(
-                host=settings.RABBITMQ_HOST,
-                port=settings.RABBITMQ_PORT,
-                login=settings.RABBITMQ_USER,
-                password=settings.RABBITMQ_PASS,
-                virtualhost=settings.RABBITMQ_VHOST
-            )
-
             # Queue the batch for processing
-            await queue_batch_for_processing(
-                connection,
-                batch_id,
-                validation_request.emails,
-                {
-                    "check_mx": validation_request.check_mx,
-                    "check_smtp": validation_request.check_smtp,
-                    "check_disposable": validation_request.check_disposable,
-                    "check_catch_all": validation_request.check_catch_all,
-                    "check_blacklist": validation_request.check_blacklist
-                }
-            )
-
-            await connection.close()
+            await publish_batch(batch_id, unique_emails, validation_flags_json)
 
             # Return batch ID for status checking
             return BatchValidationResponse(
@@ -186,41 +321,23 @@ async def validate_batch(
     
     # For multi-batch processing
     else:
-        request_id = str(uuid.uuid4())
-        batch_ids = []
+        request_id = new_batch_id()
         
         try:
-            # Connect to RabbitMQ
-            connection = await aio_pika.connect_robust(
-                host=settings.RABBITMQ_HOST,
-                port=settings.RABBITMQ_PORT,
-                login=settings.RABBITMQ_USER,
-                password=settings.RABBITMQ_PASS,
-                virtualhost=settings.RABBITMQ_VHOST
-            )
+            batch_ids = [new_batch_id() for _ in email_batches]
 
-            # Queue each batch for processing
-            for email_batch in email_batches:
-                batch_id = str(uuid.uuid4())
-                batch_ids.append(batch_id)
-                
-                await queue_batch_for_processing(
-                    connection,
-                    batch_id,
-                    email_batch,
-                    {
-                        "check_mx": validation_request.check_mx,
-                        "check_smtp": validation_request.check_smtp,
-                        "check_disposable": validation_request.check_disposable,
-                        "check_catch_all": validation_request.check_catch_all,
-                        "check_blacklist": validation_request.check_blacklist
-                    }
-                )
-            
-            await connection.close()
-            
             # Create tracking record for multi-batch request
-            await create_batch_tracking(redis_client, request_id, batch_ids, total_emails)
+            await create_batch_tracking(
+                redis_client,
+                request_id,
+                batch_ids,
+                [len(email_batch) for email_batch in email_batches],
+                total_emails
+            )
+
+            # Publish the batches after the response is sent, so large requests
+            # return as soon as the tracking record exists
+            background_tasks.add_task(publish_batches, redis_client, request_id, batch_ids, email_batches, validation_flags_json)
             
             # Calculate estimated time based on total emails
             # Assume parallel processing will be faster
@@ -249,35 +366,18 @@ async def validate_batch(
 async def get_validation_status(
     request: Request,
     batch_id: str,
+    redis_client: aioredis.Redis = Depends(get_redis_bytes),
     auth: AuthContext = RequireAuth
 ):
     """Get the status of a batch validation request"""
     logger.info(f"Validation status request from user: {auth.user_id} for batch: {batch_id}")
     
     try:
-        # Connect to Redis
-        redis_client = redis.from_url(
-            f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-            password=settings.REDIS_PASSWORD,
-            db=settings.REDIS_DB,
-            decode_responses=True
-        )
-
-        # Check if this is a child batch of a multi-batch request
-        parent_request_id = redis_client.get(f"batch_parent:{batch_id}")
-        
-        # Get results from Redis for this specific batch
-        results = redis_client.get(f"validation_results:{batch_id}")
+        parent_request_id, results, multi_batch_data = await fetch_batch_status(redis_client, batch_id)
         
         # If no results found and this is a request ID (not a batch ID)
-        if not results and not parent_request_id:
-            # Check if this is actually a request ID
-            multi_batch_data = redis_client.get(f"multi_batch:{batch_id}")
-            if multi_batch_data:
-                redis_client.close()
-                return RedirectResponse(url=f"/api/v1/multi-validation-status/{batch_id}")
-        
-        redis_client.close()
+        if not results and not parent_request_id and multi_batch_data:
+            return RedirectResponse(url=f"/api/v1/multi-validation-status/{batch_id}")
 
         if not results:
             return ValidationStatusResponse(
@@ -286,10 +386,13 @@ async def get_validation_status(
                 message="Validation in progress"
             )
 
-        results = json.loads(results)
+        if results.get("failed"):
+            status = "failed"
+        else:
+            status = "completed" if results["isComplete"] else "processing"
         return ValidationStatusResponse(
             batchId=batch_id,
-            status="completed" if results["isComplete"] else "processing",
+            status=status,
             totalEmails=results["totalEmails"],
             processedEmails=results["processedCount"],
             results=results.get("validatedEmails", []),
@@ -306,43 +409,28 @@ async def get_validation_status(
 @router.get("/cache/view/{cache_type}")
 async def view_cache(
     cache_type: str,
+    cursor: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    redis_client: aioredis.Redis = Depends(get_redis_bytes),
     auth: AuthContext = RequireAuth
 ):
-    """View cached results by type
+    """View cached results by type, one page at a time
     Types: full, mx, blacklist, disposable, catch_all
+    Pass the returned next_cursor back as cursor until it is 0.
     """
     logger.info(f"Cache view request from user: {auth.user_id} for type: {cache_type}")
     
+    index_key = CACHE_INDEX_KEYS.get(cache_type)
+    if index_key is None:
+        raise HTTPException(status_code=400, detail=f"Unknown cache type: {cache_type}")
+    
     try:
-        redis_client = redis.from_url(
-            f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-            password=settings.REDIS_PASSWORD,
-            db=settings.REDIS_DB,
-            decode_responses=True
-        )
-
-        # Get all keys for the specified cache type
-        pattern = f"{settings.CACHE_KEY_PREFIX}{cache_type}:*"
-        keys = redis_client.keys(pattern)
-        
-        # Get values for all keys
-        results = {}
-        for key in keys:
-            value = redis_client.get(key)
-            try:
-                # Try to parse JSON values
-                results[key] = json.loads(value)
-            except:
-                # If not JSON, store as is
-                results[key] = value
-
-        redis_client.close()
-        return {
-            "cache_type": cache_type,
-            "total_entries": len(keys),
-            "entries": results
-        }
-
+        # Drop index members whose entry has expired, then take the first
+        # ZSCAN step up front so Redis errors still produce a 500 before the
+        # response starts streaming
+        await redis_client.zremrangebyscore(index_key, "-inf", time.time())
+        cursor, members = await redis_client.zscan(index_key, cursor=cursor, count=limit)
+        keys = [key for key, _ in members]
     except Exception as e:
         logger.error(f"Error viewing cache: {str(e)}")
         raise HTTPException(
@@ -350,9 +438,15 @@ async def view_cache(
             detail=f"Failed to view cache: {str(e)}"
         )
 
+    return StreamingResponse(
+        stream_cache_entries(redis_client, cache_type, index_key, cursor, keys, limit),
+        media_type="application/json"
+    )
+
 @router.delete("/cache/clear/{cache_type}")
 async def clear_cache(
     cache_type: str,
+    redis_client: aioredis.Redis = Depends(get_redis),
     auth: AuthContext = RequireAuth
 ):
     """Clear cache by type
@@ -360,31 +454,22 @@ async def clear_cache(
     """
     logger.info(f"Cache clear request from user: {auth.user_id} for type: {cache_type}")
     
+    if cache_type == "all":
+        index_keys = CACHE_INDEX_KEYS.values()
+    elif cache_type in CACHE_INDEX_KEYS:
+        index_keys = (CACHE_INDEX_KEYS[cache_type],)
+    else:
+        raise HTTPException(status_code=400, detail=f"Unknown cache type: {cache_type}")
+    
     try:
-        redis_client = redis.from_url(
-            f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-            password=settings.REDIS_PASSWORD,
-            db=settings.REDIS_DB,
-            decode_responses=True
-        )
+        cleared_entries = 0
+        for index_key in index_keys:
+            cleared_entries += await unlink_indexed_keys(redis_client, index_key)
 
-        if cache_type == "all":
-            pattern = f"{settings.CACHE_KEY_PREFIX}*"
-        else:
-            pattern = f"{settings.CACHE_KEY_PREFIX}{cache_type}:*"
-
-        # Get all keys matching the pattern
-        keys = redis_client.keys(pattern)
-        
-        # Delete all matching keys
-        if keys:
-            redis_client.delete(*keys)
-
-        redis_client.close()
         return {
             "cache_type": cache_type,
-            "cleared_entries": len(keys),
-            "message": f"Successfully cleared {len(keys)} cache entries"
+            "cleared_entries": cleared_entries,
+            "message": f"Successfully cleared {cleared_entries} cache entries"
         }
 
     except Exception as e:
@@ -406,7 +491,7 @@ async def get_circuit_breaker_status(
     logger.info(f"Circuit breaker status request from user: {auth.user_id}")
     
     try:
-        metrics = circuit_breaker.get_metrics()
+        metrics = await circuit_breaker.get_metrics()
         return {
             "status": metrics["status"],
             "consecutive_smtp_timeouts": metrics["consecutive_smtp_timeouts"],
@@ -430,7 +515,7 @@ async def reset_circuit_breaker(circuit_breaker: CircuitBreaker = Depends(get_ci
     Reset circuit breaker to closed state
     """
     try:
-        circuit_breaker.reset()
+        await circuit_breaker.reset()
         return {"status": "success", "message": "Circuit breaker reset successfully"}
     except Exception as e:
         logger.error(f"Error resetting circuit breaker: {str(e)}")
@@ -455,7 +540,7 @@ async def test_dns_validation(
 
 @router.post("/validate-email")
 @limiter.limit(RATE_LIMITS["single_validation"])
-async def validate_email(
+async def validate_email_query(
     request: Request,
     email: str,
     check_mx: bool = True,
@@ -467,21 +552,20 @@ async def validate_email(
 ) -> EmailValidationResult:
     """
     Validate a single email address
+    Prefer POST /validate-batch, which takes 1..N emails per request.
     """
     logger.info(f"Direct email validation request from user: {auth.user_id} for email: {email}")
     
-    try:
-        result = await email_validator.validate_email(
-            email=email,
-            check_mx=check_mx,
-            check_smtp=check_smtp,
-            check_disposable=check_disposable,
-            check_catch_all=check_catch_all,
-            check_blacklist=check_blacklist
-        )
-        return result
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    [result] = await validate_directly([email], {
+        "check_mx": check_mx,
+        "check_smtp": check_smtp,
+        "check_disposable": check_disposable,
+        "check_catch_all": check_catch_all,
+        "check_blacklist": check_blacklist
+    })
+    if isinstance(result, Exception):
+        raise HTTPException(status_code=500, detail=str(result))
+    return result
 
 @router.get("/multi-validation-status/{request_id}", response_model=MultiStatusResponse)
 @limiter.limit(RATE_LIMITS["status_check"])
@@ -7,7 +7,6 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request
-import redis
 
 from ..config import settings
 
@@ -25,18 +24,10 @@ def get_user_id(request: Request) -> str:
     # Fallback to IP address
     return get_remote_address(request)
 
-# Create Redis connection for rate limiter
-redis_client = redis.from_url(
-    f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
-    password=settings.REDIS_PASSWORD,
-    db=settings.REDIS_DB,
-    decode_responses=True
-)
-
 # Create limiter instance
 limiter = Limiter(
     key_func=get_user_id,
-    storage_uri=f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
+    storage_uri=settings.REDIS_URL,
     storage_options={"password": settings.REDIS_PASSWORD, "db": settings.REDIS_DB}
 )
 
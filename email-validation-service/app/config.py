@@ -51,6 +51,7 @@ class Settings(BaseSettings):
     # Circuit Breaker Settings
     SMTP_CIRCUIT_BREAKER_THRESHOLD: int = 10  # Number of failures before opening circuit
     SMTP_CIRCUIT_BREAKER_TIMEOUT: int = 300   # Seconds to wait before attempting recovery
+    SMTP_CIRCUIT_BREAKER_STATUS_TTL: float = 0.5  # Seconds a process reuses the last circuit status read
     SMTP_ERROR_THRESHOLD_PERCENTAGE: int = 30  # Percentage of errors to trigger circuit
     DNS_ONLY_MODE_ENABLED: bool = False       # Emergency switch for DNS-only mode
     
@@ -73,6 +74,11 @@ class Settings(BaseSettings):
     ENABLE_BLACKLIST_CACHE: bool = True
     ENABLE_DISPOSABLE_CACHE: bool = True
     ENABLE_CATCH_ALL_CACHE: bool = True
+    CACHE_SCAN_COUNT: int = 1000           # Keys per SCAN step when listing/clearing cache
+    CACHE_DELETE_CHUNK_SIZE: int = 500     # Keys per UNLINK command when clearing cache
+    STATUS_CACHE_TTL: float = 0.4          # Seconds a batch status lookup is shared between pollers
+    STATUS_CACHE_COMPLETED_TTL: float = 5.0  # Seconds a completed batch's results are kept in process
+    STATUS_CACHE_MAX_ENTRIES: int = 1000   # Batch status lookups kept per API process
     
     # RabbitMQ settings
     RABBITMQ_HOST: str
@@ -82,6 +88,8 @@ class Settings(BaseSettings):
     RABBITMQ_VHOST: str = "/"
     RABBITMQ_QUEUE: str = "email_validation"
     RABBITMQ_DLQ: str = "email_validation_dlq"
+    RABBITMQ_CHANNEL_POOL_SIZE: int = 8  # Channels used to publish batches concurrently
+    RABBITMQ_PUBLISHER_CONFIRMS: bool = False  # Wait for broker acks when publishing batches
     
     # Redis settings
     REDIS_HOST: str
@@ -89,6 +97,9 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: Optional[str] = None
     REDIS_RESULT_EXPIRY: int = 3600
+    REDIS_MAX_CONNECTIONS: int = 50  # Size of the API's shared Redis connection pool
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30  # Seconds idle before a pooled connection is checked on reuse
+    REDIS_RESULT_COMPRESSION_LEVEL: int = 3  # gzip level for validation_results payloads
     
     # For smaller batches, process directly
     SMALL_BATCH_THRESHOLD: int = 1
@@ -99,6 +110,11 @@ class Settings(BaseSettings):
     WORKER_PREFETCH_COUNT: int = 1
     MAX_RETRIES: int = 3
 
+    @property
+    def REDIS_URL(self) -> str:
+        """Redis connection URL shared by every client and pool."""
+        return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}"
+
     @validator('API_KEY')
     def validate_api_key(cls, v: str) -> str:
         """Validate API key strength."""
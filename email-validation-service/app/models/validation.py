@@ -89,7 +89,7 @@ class MultiBatchResponse(BaseModel):
 
 class ValidationStatusResponse(BaseModel):
     batchId: str
-    status: str  # "processing" or "completed"
+    status: str  # "processing", "completed" or "failed"
     message: Optional[str] = None
     totalEmails: Optional[int] = None
     processedEmails: Optional[int] = None
@@ -99,7 +99,7 @@ class ValidationStatusResponse(BaseModel):
 class MultiStatusResponse(BaseModel):
     requestId: str
     batchIds: List[str]
-    status: str  # "processing" or "completed"
+    status: str  # "processing", "completed" or "failed"
     totalEmails: int
     processedEmails: int
     progress: Optional[str] = None
@@ -1,30 +1,139 @@
 from redis import asyncio as aioredis
-import json
-from typing import Optional, Dict, Any
+import orjson
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+from typing import Optional, Dict, Any, List, Union, Callable, Awaitable
+from pydantic import BaseModel
 from ..config import settings
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Cache types that can be listed or cleared through the API
+CACHE_TYPES = ("full", "mx", "blacklist", "disposable", "catch_all")
+
+# Prefix of every cache key of each cache type, built once at import
+CACHE_KEY_PREFIXES = {
+    cache_type: f"{settings.CACHE_KEY_PREFIX}{cache_type}:"
+    for cache_type in CACHE_TYPES
+}
+
+# TTL every entry of each cache type is written with
+CACHE_TTLS = {
+    "full": settings.CACHE_TTL_FULL_RESULT,
+    "mx": settings.CACHE_TTL_MX_RECORDS,
+    "blacklist": settings.CACHE_TTL_BLACKLIST,
+    "disposable": settings.CACHE_TTL_DISPOSABLE,
+    "catch_all": settings.CACHE_TTL_CATCH_ALL,
+}
+
+# Key of the Sorted Set indexing every cache key written for each cache type,
+# scored by the Unix time the entry expires
+CACHE_INDEX_KEYS = {
+    cache_type: f"{settings.CACHE_KEY_PREFIX}expiry_index:{cache_type}"
+    for cache_type in CACHE_TYPES
+}
+
+# Set once the entries written before the expiry indexes have been indexed
+CACHE_INDEX_BACKFILL_KEY = f"{settings.CACHE_KEY_PREFIX}expiry_index:backfilled"
+
+# Set-based indexes that the expiry indexes replaced
+LEGACY_CACHE_INDEX_KEYS = [
+    f"{settings.CACHE_KEY_PREFIX}index:{cache_type}"
+    for cache_type in CACHE_TYPES
+]
+
+def index_cache_keys(pipe: Any, cache_type: str, keys: List[str], ttl: int) -> None:
+    """Queue on pipe the commands indexing keys, which were just written with ttl
+
+    Index members whose entry has expired are trimmed by score on every write,
+    so the index holds live keys only. The index itself expires with its
+    newest entry.
+    """
+    now = time.time()
+    index_key = CACHE_INDEX_KEYS[cache_type]
+    pipe.zadd(index_key, {key: now + ttl for key in keys})
+    pipe.zremrangebyscore(index_key, "-inf", now)
+    pipe.expire(index_key, ttl)
+
+async def _index_existing_keys(redis_client: aioredis.Redis, cache_type: str, keys: List[str]) -> int:
+    """Index keys of cache_type under their remaining TTL, returning how many were indexed"""
+    pipe = redis_client.pipeline(transaction=False)
+    for key in keys:
+        pipe.ttl(key)
+    ttls = await pipe.execute()
+
+    # Every cache entry is written with SETEX; keys gone since the SCAN have
+    # a negative TTL and are skipped
+    now = time.time()
+    members = {key: now + ttl for key, ttl in zip(keys, ttls) if ttl > 0}
+    if members:
+        index_key = CACHE_INDEX_KEYS[cache_type]
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.zadd(index_key, members)
+        pipe.expire(index_key, CACHE_TTLS[cache_type])
+        await pipe.execute()
+    return len(members)
+
+async def backfill_cache_indexes(redis_client: aioredis.Redis) -> int:
+    """Index cache entries written before the expiry indexes, once per Redis database
+
+    Entries of each type are found with SCAN and indexed under their
+    remaining TTL, so view_cache and clear_cache reach them too. The
+    Set-based indexes they replace are then removed. Returns how many entries
+    were indexed, or 0 if this has run already.
+    """
+    if not await redis_client.set(CACHE_INDEX_BACKFILL_KEY, 1, nx=True):
+        return 0
+
+    try:
+        indexed = 0
+        for cache_type in CACHE_TYPES:
+            chunk = []
+            async for key in redis_client.scan_iter(
+                match=f"{CACHE_KEY_PREFIXES[cache_type]}*", count=settings.CACHE_SCAN_COUNT
+            ):
+                chunk.append(key)
+                if len(chunk) >= settings.CACHE_SCAN_COUNT:
+                    indexed += await _index_existing_keys(redis_client, cache_type, chunk)
+                    chunk = []
+            if chunk:
+                indexed += await _index_existing_keys(redis_client, cache_type, chunk)
+
+        await redis_client.unlink(*LEGACY_CACHE_INDEX_KEYS)
+        return indexed
+    except Exception:
+        # Let the next startup try again
+        await redis_client.delete(CACHE_INDEX_BACKFILL_KEY)
+        raise
+
 class CacheService:
     def __init__(self):
         self.redis = None
+        self._full_prefix = CACHE_KEY_PREFIXES["full"]
+        self._mx_prefix = CACHE_KEY_PREFIXES["mx"]
+        self._blacklist_prefix = CACHE_KEY_PREFIXES["blacklist"]
+        self._catch_all_prefix = CACHE_KEY_PREFIXES["catch_all"]
+        self._disposable_prefix = CACHE_KEY_PREFIXES["disposable"]
         self._connect()
 
     def _connect(self):
         """Initialize Redis connection"""
         try:
-            redis_url = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}"
-            logger.info(f"Connecting to Redis at {redis_url} (db={settings.REDIS_DB})")
+            logger.info(f"Connecting to Redis at {settings.REDIS_URL} (db={settings.REDIS_DB})")
             
-            self.redis = aioredis.from_url(
-                redis_url,
+            pool = aioredis.ConnectionPool.from_url(
+                settings.REDIS_URL,
                 password=settings.REDIS_PASSWORD,
                 db=settings.REDIS_DB,
                 decode_responses=True,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
                 socket_connect_timeout=5.0,  # Add timeout for Docker connection
+                socket_keepalive=True,
+                health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
                 retry_on_timeout=True  # Enable retries
             )
+            self.redis = aioredis.Redis(connection_pool=pool)
             logger.info("Successfully connected to Redis")
         except Exception as e:
             logger.error(f"Failed to connect to Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}: {str(e)}")
@@ -32,28 +141,36 @@ class CacheService:
             self.redis = None
 
     async def _ensure_connection(self):
-        """Ensure Redis connection is active"""
+        """Ensure a Redis client exists; broken connections are handled in _execute"""
         if self.redis is None:
             self._connect()
+        return self.redis is not None
+
+    async def _execute(self, command: Callable[[aioredis.Redis], Awaitable[Any]]) -> Any:
+        """Run command against the client, reconnecting and retrying once if the connection dropped"""
         try:
-            # Test the connection
-            pong = await self.redis.ping()
-            if pong:
-                # Get Redis info for verification
-                info = await self.redis.info()
-                logger.debug(f"Redis connection verified - Version: {info.get('redis_version')}, "
-                           f"Connected clients: {info.get('connected_clients')}")
-            return True
-        except Exception as e:
-            logger.error(f"Redis connection test failed: {str(e)}")
-            self._connect()  # Try to reconnect
+            return await command(self.redis)
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            logger.warning(f"Redis connection lost, reconnecting: {str(e)}")
+            # Release the old pool's sockets before replacing it
             try:
-                await self.redis.ping()  # Test again
-                return True
-            except Exception as e:
-                logger.error(f"Redis reconnection failed: {str(e)}")
-                logger.error("Please check your Redis connection settings and ensure the service is running")
-                return False
+                await self.redis.connection_pool.disconnect()
+            except Exception as disconnect_error:
+                logger.warning(f"Error disconnecting old Redis pool: {str(disconnect_error)}")
+            self._connect()
+            if self.redis is None:
+                raise
+            return await command(self.redis)
+
+    async def _store(self, cache_type: str, key: str, ttl: int, value: Union[str, bytes]) -> None:
+        """Write a cache entry and record its key in the cache type's index"""
+        def store(client: aioredis.Redis) -> Awaitable[Any]:
+            pipe = client.pipeline(transaction=False)
+            pipe.setex(key, ttl, value)
+            index_cache_keys(pipe, cache_type, [key], ttl)
+            return pipe.execute()
+
+        await self._execute(store)
 
     async def get_cached_result(self, email: str) -> Optional[Dict]:
         """Get cached full validation result for an email"""
@@ -64,14 +181,14 @@ class CacheService:
             return None
 
         try:
-            key = f"{settings.CACHE_KEY_PREFIX}full:{email}"
-            cached = await self.redis.get(key)
-            return json.loads(cached) if cached else None
+            key = self._full_prefix + email
+            cached = await self._execute(lambda client: client.get(key))
+            return orjson.loads(cached) if cached else None
         except Exception as e:
             logger.error(f"Error getting cached result for {email}: {str(e)}")
             return None
 
-    async def cache_result(self, email: str, result: Dict) -> None:
+    async def cache_result(self, email: str, result: Union[BaseModel, Dict]) -> None:
         """Cache full validation result for an email"""
         if not settings.ENABLE_RESULT_CACHE:
             return
@@ -80,12 +197,13 @@ class CacheService:
             return
 
         try:
-            key = f"{settings.CACHE_KEY_PREFIX}full:{email}"
-            await self.redis.setex(
-                key,
-                settings.CACHE_TTL_FULL_RESULT,
-                json.dumps(result)
-            )
+            key = self._full_prefix + email
+            # Models serialize straight to JSON, skipping the dict round trip
+            if isinstance(result, BaseModel):
+                payload = result.model_dump_json(by_alias=True)
+            else:
+                payload = orjson.dumps(result)
+            await self._store("full", key, settings.CACHE_TTL_FULL_RESULT, payload)
             logger.info(f"Successfully cached result for {email}")
         except Exception as e:
             logger.error(f"Error caching result for {email}: {str(e)}")
@@ -99,9 +217,9 @@ class CacheService:
             return None
 
         try:
-            key = f"{settings.CACHE_KEY_PREFIX}mx:{domain}"
-            cached = await self.redis.get(key)
-            return json.loads(cached) if cached else None
+            key = self._mx_prefix + domain
+            cached = await self._execute(lambda client: client.get(key))
+            return orjson.loads(cached) if cached else None
         except Exception as e:
             logger.error(f"Error getting cached MX records for {domain}: {str(e)}")
             return None
@@ -115,12 +233,8 @@ class CacheService:
             return
 
         try:
-            key = f"{settings.CACHE_KEY_PREFIX}mx:{domain}"
-            await self.redis.setex(
-                key,
-                settings.CACHE_TTL_MX_RECORDS,
-                json.dumps(mx_records)
-            )
+            key = self._mx_prefix + domain
+            await self._store("mx", key, settings.CACHE_TTL_MX_RECORDS, orjson.dumps(mx_records))
             logger.info(f"Successfully cached MX records for {domain}")
         except Exception as e:
             logger.error(f"Error caching MX records for {domain}: {str(e)}")
@@ -134,9 +248,9 @@ class CacheService:
             return None
 
         try:
-            key = f"{settings.CACHE_KEY_PREFIX}blacklist:{domain}"
-            cached = await self.redis.get(key)
-            return json.loads(cached) if cached else None
+            key = self._blacklist_prefix + domain
+            cached = await self._execute(lambda client: client.get(key))
+            return orjson.loads(cached) if cached else None
         except Exception as e:
             logger.error(f"Error getting cached blacklist result for {domain}: {str(e)}")
             return None
@@ -150,12 +264,8 @@ class CacheService:
             return
 
         try:
-            key = f"{settings.CACHE_KEY_PREFIX}blacklist:{domain}"
-            await self.redis.setex(
-                key,
-                settings.CACHE_TTL_BLACKLIST,
-                json.dumps(result)
-            )
+            key = self._blacklist_prefix + domain
+            await self._store("blacklist", key, settings.CACHE_TTL_BLACKLIST, orjson.dumps(result))
             logger.info(f"Successfully cached blacklist result for {domain}")
         except Exception as e:
             logger.error(f"Error caching blacklist result for {domain}: {str(e)}")
@@ -169,8 +279,8 @@ class CacheService:
             return None
 
         try:
-            key = f"{settings.CACHE_KEY_PREFIX}catch_all:{domain}"
-            return await self.redis.get(key) == "1"
+            key = self._catch_all_prefix + domain
+            return await self._execute(lambda client: client.get(key)) == "1"
         except Exception as e:
             logger.error(f"Error getting cached catch-all status for {domain}: {str(e)}")
             return None
@@ -184,12 +294,8 @@ class CacheService:
             return
 
         try:
-            key = f"{settings.CACHE_KEY_PREFIX}catch_all:{domain}"
-            await self.redis.setex(
-                key,
-                settings.CACHE_TTL_CATCH_ALL,
-                "1" if is_catch_all else "0"
-            )
+            key = self._catch_all_prefix + domain
+            await self._store("catch_all", key, settings.CACHE_TTL_CATCH_ALL, "1" if is_catch_all else "0")
             logger.info(f"Successfully cached catch-all status for {domain}")
         except Exception as e:
             logger.error(f"Error caching catch-all status for {domain}: {str(e)}")
@@ -203,8 +309,8 @@ class CacheService:
             return None
 
         try:
-            key = f"{settings.CACHE_KEY_PREFIX}disposable:{domain}"
-            return await self.redis.get(key) == "1"
+            key = self._disposable_prefix + domain
+            return await self._execute(lambda client: client.get(key)) == "1"
         except Exception as e:
             logger.error(f"Error getting cached disposable status for {domain}: {str(e)}")
             return None
@@ -218,12 +324,8 @@ class CacheService:
             return
 
         try:
-            key = f"{settings.CACHE_KEY_PREFIX}disposable:{domain}"
-            await self.redis.setex(
-                key,
-                settings.CACHE_TTL_DISPOSABLE,
-                "1" if is_disposable else "0"
-            )
+            key = self._disposable_prefix + domain
+            await self._store("disposable", key, settings.CACHE_TTL_DISPOSABLE, "1" if is_disposable else "0")
             logger.info(f"Successfully cached disposable status for {domain}")
         except Exception as e:
             logger.error(f"Error caching disposable status for {domain}: {str(e)}")
@@ -233,6 +335,7 @@ class CacheService:
         if self.redis:
             try:
                 await self.redis.close()
+                await self.redis.connection_pool.disconnect()
                 logger.info("Redis connection closed")
             except Exception as e:
                 logger.error(f"Error closing Redis connection: {str(e)}") 
\ No newline at end of file
@@ -1,10 +1,43 @@
-import redis
+from redis import asyncio as aioredis
 import logging
+import time
 from datetime import datetime
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# Count a timeout and open the circuit when the consecutive count reaches the
+# threshold, in one atomic server-side step. The status key gets its TTL only
+# when the circuit opens, so later timeouts never extend an open circuit.
+# KEYS: state hash, totals hash, status key. ARGV: timestamp, expiry, threshold.
+# Returns the consecutive count and 1 if this call opened the circuit.
+RECORD_TIMEOUT_SCRIPT = """
+local failures = redis.call('HINCRBY', KEYS[1], 'consecutive_failures', 1)
+redis.call('HSET', KEYS[1], 'last_timeout', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+redis.call('HINCRBY', KEYS[2], 'total_timeouts', 1)
+local opened = 0
+if failures >= tonumber(ARGV[3]) and redis.call('GET', KEYS[3]) ~= 'open' then
+    redis.call('SET', KEYS[3], 'open', 'EX', ARGV[2])
+    opened = 1
+end
+return {failures, opened}
+"""
+
+# Fold the historical counters kept in plain keys before the totals hash
+# existed into it, once; the old keys are deleted as they are folded in.
+# KEYS: totals hash, then the old keys. ARGV: the hash field of each old key.
+MIGRATE_TOTALS_SCRIPT = """
+for i = 2, #KEYS do
+    local value = redis.call('GET', KEYS[i])
+    if value then
+        redis.call('HINCRBY', KEYS[1], ARGV[i - 1], value)
+        redis.call('DEL', KEYS[i])
+    end
+end
+return 0
+"""
+
 class CircuitBreaker:
     """
     Circuit breaker implementation for SMTP validation service.
@@ -12,25 +45,36 @@ class CircuitBreaker:
     Designed to work across multiple worker processes by using Redis for state.
     """
     
-    def __init__(self, redis_client: redis.Redis):
+    def __init__(self, redis_client: aioredis.Redis):
         self.redis = redis_client
+        self._record_timeout = self.redis.register_script(RECORD_TIMEOUT_SCRIPT)
+        self._migrate_totals = self.redis.register_script(MIGRATE_TOTALS_SCRIPT)
         self.failure_threshold = settings.SMTP_CIRCUIT_BREAKER_THRESHOLD
         
-        # Redis keys
-        self.consecutive_failures_key = "smtp_consecutive_timeout_failures"
+        # Redis hashes: the current state expires with the breaker timeout,
+        # the historical counters are kept. The open status is a key of its
+        # own whose TTL is set once, when the circuit opens.
+        self.state_key = "smtp_circuit_state"
+        self.totals_key = "smtp_circuit_totals"
         self.status_key = "smtp_circuit_status"
-        self.last_timeout_key = "smtp_last_timeout"
         
-        # Redis keys for historical metrics
-        self.total_timeouts_key = "smtp_total_timeouts_historical"
-        self.total_dns_fallbacks_key = "smtp_total_dns_fallbacks_historical"
+        # Historical counters from before the totals hash, by hash field
+        self.legacy_totals_keys = {
+            "total_timeouts": "smtp_total_timeouts_historical",
+            "total_dns_fallbacks": "smtp_total_dns_fallbacks_historical"
+        }
+        self._totals_migrated = False
         
         # Set expiration for circuit breaker keys (in seconds)
         # This ensures the circuit will reset after this time period
         self.key_expiry = settings.SMTP_CIRCUIT_BREAKER_TIMEOUT
+        
+        # Last status read from Redis; the breaker flips rarely, so every
+        # validation in this process reuses it for a short while
+        self._cached_status = False
+        self._cached_at = 0.0
     
-    @property
-    def is_open(self) -> bool:
+    async def is_open(self) -> bool:
         """
         Check if circuit breaker is open (SMTP should not be used)
         Returns True if circuit is open, False otherwise
@@ -40,126 +84,102 @@ class CircuitBreaker:
             logger.info("DNS_ONLY_MODE is enabled in settings, circuit is open")
             return True
             
+        now = time.monotonic()
+        if now - self._cached_at < settings.SMTP_CIRCUIT_BREAKER_STATUS_TTL:
+            return self._cached_status
+            
         # Check circuit status in Redis
-        status = self.redis.get(self.status_key)
+        status = await self.redis.get(self.status_key)
         is_open = status == "open"
+        self._cached_status = is_open
+        self._cached_at = now
         
         if is_open:
             logger.info("Circuit breaker is open, using DNS validation")
         
         return is_open
     
-    def record_smtp_timeout(self):
+    async def record_smtp_timeout(self):
         """
         Record an SMTP timeout failure and potentially open the circuit
         Only called when there's an actual SMTP timeout/connection failure
         """
-        # Use Redis transaction to ensure atomicity
-        with self.redis.pipeline() as pipe:
-            while True:
-                try:
-                    # Watch the keys we're going to modify
-                    pipe.watch(self.consecutive_failures_key, self.status_key)
-                    
-                    # Get current values
-                    current_consecutive_failures = int(pipe.get(self.consecutive_failures_key) or 0)
-                    current_status = pipe.get(self.status_key)
-                    
-                    # Start transaction
-                    pipe.multi()
-                    
-                    # Increment consecutive failure counter
-                    new_failure_count = current_consecutive_failures + 1
-                    pipe.set(self.consecutive_failures_key, new_failure_count)
-                    pipe.expire(self.consecutive_failures_key, self.key_expiry)
-                    
-                    # Set last timeout timestamp
-                    now = datetime.now().isoformat()
-                    pipe.set(self.last_timeout_key, now)
-                    pipe.expire(self.last_timeout_key, self.key_expiry)
-                    
-                    # Increment total timeouts counter (historical)
-                    pipe.incr(self.total_timeouts_key)
-                    
-                    # Check if we should open the circuit - ONLY if we have CONSECUTIVE failures
-                    if new_failure_count >= self.failure_threshold and current_status != "open":
-                        logger.warning(f"CONSECUTIVE SMTP timeout threshold reached ({new_failure_count}/{self.failure_threshold}), opening circuit")
-                        pipe.set(self.status_key, "open")
-                        pipe.expire(self.status_key, self.key_expiry)
-                    
-                    # Execute transaction
-                    pipe.execute()
-                    
-                    # Log the current state
-                    logger.info(f"SMTP timeout recorded. Consecutive count: {new_failure_count}/{self.failure_threshold}, Status: {'open' if current_status == 'open' else 'closed'}, Time: {now}")
-                    
-                    break
-                    
-                except redis.WatchError:
-                    # Another client modified the keys, retry
-                    logger.warning("Redis WatchError occurred, retrying transaction")
-                    continue
+        now = datetime.now().isoformat()
+        
+        # The script opens the circuit once, when the CONSECUTIVE failures
+        # reach the threshold; concurrent workers never lose a count
+        new_failure_count, opened = await self._record_timeout(
+            keys=[self.state_key, self.totals_key, self.status_key],
+            args=[now, self.key_expiry, self.failure_threshold]
+        )
+        
+        if opened:
+            self._cached_at = 0.0
+            logger.warning(f"CONSECUTIVE SMTP timeout threshold reached ({new_failure_count}/{self.failure_threshold}), opened circuit")
+        
+        # Log the current state
+        logger.info(f"SMTP timeout recorded. Consecutive count: {new_failure_count}/{self.failure_threshold}, Status: {'open' if new_failure_count >= self.failure_threshold else 'closed'}, Time: {now}")
     
-    def record_smtp_success(self):
+    async def record_smtp_success(self):
         """
         Record a successful SMTP validation - resets the consecutive failure counter
         """
         # Reset consecutive failures counter when a successful validation occurs
-        self.redis.set(self.consecutive_failures_key, 0)
-        self.redis.expire(self.consecutive_failures_key, self.key_expiry)
+        pipe = self.redis.pipeline()
+        pipe.hset(self.state_key, "consecutive_failures", 0)
+        pipe.expire(self.state_key, self.key_expiry)
+        await pipe.execute()
         logger.info("SMTP validation successful, reset consecutive timeout counter")
     
-    def record_dns_fallback(self):
+    async def record_dns_fallback(self):
         """
         Record when we fall back to DNS validation
         """
-        self.redis.incr(self.total_dns_fallbacks_key)
+        await self.redis.hincrby(self.totals_key, "total_dns_fallbacks", 1)
     
-    def open_circuit(self):
+    async def open_circuit(self):
         """
         Open the circuit to prevent SMTP usage
         """
         logger.warning("Opening circuit breaker - switching to DNS-only mode")
-        self.redis.set(self.status_key, "open")
-        self.redis.expire(self.status_key, self.key_expiry)
+        await self.redis.set(self.status_key, "open", ex=self.key_expiry)
+        self._cached_at = 0.0
     
-    def reset(self):
+    async def reset(self):
         """
         Reset the circuit breaker state
         """
         pipe = self.redis.pipeline()
-        pipe.set(self.consecutive_failures_key, 0)
-        pipe.expire(self.consecutive_failures_key, self.key_expiry)
-        pipe.set(self.status_key, "closed")
-        pipe.expire(self.status_key, self.key_expiry)
-        pipe.execute()
+        pipe.hset(self.state_key, "consecutive_failures", 0)
+        pipe.expire(self.state_key, self.key_expiry)
+        pipe.delete(self.status_key)
+        await pipe.execute()
         
+        self._cached_at = 0.0
         logger.info("Reset circuit breaker state")
     
-    def get_metrics(self) -> dict:
+    async def get_metrics(self) -> dict:
         """
         Get current circuit breaker metrics
         """
-        pipe = self.redis.pipeline()
-        pipe.get(self.consecutive_failures_key)
-        pipe.get(self.status_key)
-        pipe.get(self.last_timeout_key)
-        pipe.get(self.total_timeouts_key)
-        pipe.get(self.total_dns_fallbacks_key)
-        
-        results = pipe.execute()
+        if not self._totals_migrated:
+            await self._migrate_totals(
+                keys=[self.totals_key, *self.legacy_totals_keys.values()],
+                args=list(self.legacy_totals_keys)
+            )
+            self._totals_migrated = True
         
-        consecutive_timeouts = int(results[0] or 0)
-        status = results[1]
-        last_timeout = results[2]
-        total_timeouts = int(results[3] or 0)
-        total_dns_fallbacks = int(results[4] or 0)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(self.status_key)
+        pipe.hgetall(self.state_key)
+        pipe.hgetall(self.totals_key)
+        status, state, totals = await pipe.execute()
             
         return {
-            "status": status if status else "closed",
-            "consecutive_smtp_timeouts": consecutive_timeouts,
-            "total_timeouts": total_timeouts,
-            "total_dns_fallbacks": total_dns_fallbacks,
-            "last_timeout": last_timeout,
+            "status": status or "closed",
+            "consecutive_smtp_timeouts": int(state.get("consecutive_failures", 0)),
+            "total_timeouts": int(totals.get("total_timeouts", 0)),
+            "total_dns_fallbacks": int(totals.get("total_dns_fallbacks", 0)),
+            "last_timeout": state.get("last_timeout"),
             "timeout_threshold": self.failure_threshold
         }
\ No newline at end of file
@@ -2,7 +2,7 @@ import re
 import dns.asyncresolver
 import aiosmtplib
 import socket
-import redis
+from redis import asyncio as aioredis
 from typing import List, Dict, Optional, Tuple
 from email.utils import parseaddr
 import asyncio
@@ -41,21 +41,6 @@ class EmailValidator:
         self.disposable_domains = DISPOSABLE_DOMAINS
         self.smtp_providers = SMTP_PROVIDERS
         
-        # Initialize Redis client for circuit breaker
-        redis_client = redis.Redis(
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            password=settings.REDIS_PASSWORD,
-            db=settings.REDIS_DB,
-            decode_responses=True
-        )
-        
-        # Initialize circuit breaker
-        self.circuit_breaker = CircuitBreaker(redis_client)
-        
-        # Initialize DNS validator for fallback
-        self.dns_validator = DNSValidator()
-        
         # Blacklist services
         self.blacklist_services = [
             'zen.spamhaus.org',
@@ -92,8 +77,8 @@ class EmailValidator:
         }
         
         # Initialize Redis client
-        self.redis = redis.from_url(
-            f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
+        self.redis = aioredis.from_url(
+            settings.REDIS_URL,
             password=settings.REDIS_PASSWORD,
             db=settings.REDIS_DB,
             decode_responses=True
@@ -114,7 +99,7 @@ class EmailValidator:
         logger.info(f"Starting validation for: {email}")
         
         # Check if circuit breaker is open (SMTP service is down)
-        if self.circuit_breaker.is_open:
+        if await self.circuit_breaker.is_open():
             logger.info(f"Circuit breaker is open, using DNS-only validation for {email}")
             # Use DNS validation instead of SMTP
             result = await self.dns_validator.validate(email)
@@ -224,12 +209,12 @@ class EmailValidator:
                         # Check if this was a timeout or connection error
                         if smtp_result.get("is_timeout", False):
                             # Record SMTP timeout in circuit breaker
-                            self.circuit_breaker.record_smtp_timeout()
+                            await self.circuit_breaker.record_smtp_timeout()
                             
                             # Only fall back to DNS validation if circuit breaker is open
-                            if self.circuit_breaker.is_open:
+                            if await self.circuit_breaker.is_open():
                                 logger.warning(f"Circuit breaker is open, falling back to DNS validation for {email}")
-                                self.circuit_breaker.record_dns_fallback()
+                                await self.circuit_breaker.record_dns_fallback()
                                 dns_result = await self.dns_validator.validate(email)
                                 dns_result.details.general["validation_method"] = "dns"
                                 dns_result.details.general["reason"] += " (Circuit breaker open - DNS fallback)"
@@ -243,7 +228,7 @@ class EmailValidator:
                                 return result
                         else:
                             # Record successful SMTP validation to reset consecutive timeout counter
-                            self.circuit_breaker.record_smtp_success()
+                            await self.circuit_breaker.record_smtp_success()
                         
                         # Process normal SMTP result
                         if smtp_result.get("exists") is True:
@@ -267,12 +252,12 @@ class EmailValidator:
                         
                     except asyncio.TimeoutError:
                         # Record SMTP timeout in circuit breaker
-                        self.circuit_breaker.record_smtp_timeout()
+                        await self.circuit_breaker.record_smtp_timeout()
                         
                         # Only fall back to DNS validation if circuit breaker is open
-                        if self.circuit_breaker.is_open:
+                        if await self.circuit_breaker.is_open():
                             logger.warning(f"Circuit breaker is open, falling back to DNS validation for {email}")
-                            self.circuit_breaker.record_dns_fallback()
+                            await self.circuit_breaker.record_dns_fallback()
                             dns_result = await self.dns_validator.validate(email)
                             dns_result.details.general["validation_method"] = "dns"
                             dns_result.details.general["reason"] += " (Circuit breaker open - DNS fallback)"
@@ -294,12 +279,12 @@ class EmailValidator:
                             "refused" in error_str or
                             "reset" in error_str):
                             logger.warning(f"SMTP connection error for {email}: {str(e)}")
-                            self.circuit_breaker.record_smtp_timeout()
+                            await self.circuit_breaker.record_smtp_timeout()
                             
                             # Only fall back to DNS validation if circuit breaker is open
-                            if self.circuit_breaker.is_open:
+                            if await self.circuit_breaker.is_open():
                                 logger.warning(f"Circuit breaker is open, falling back to DNS validation for {email}")
-                                self.circuit_breaker.record_dns_fallback()
+                                await self.circuit_breaker.record_dns_fallback()
                                 dns_result = await self.dns_validator.validate(email)
                                 dns_result.details.general["validation_method"] = "dns"
                                 dns_result.details.general["reason"] += " (Circuit breaker open - DNS fallback)"
@@ -1,15 +1,18 @@
 import uuid
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import math
 import logging
-import json
+import gzip
+import orjson
 import asyncio
 import aio_pika
 from datetime import datetime
 import redis
 import os
+import time
 
 from ..config import settings
+from ..services.cache_service import CACHE_KEY_PREFIXES, index_cache_keys
 
 # Create logs directory if it doesn't exist
 os.makedirs('logs', exist_ok=True)
@@ -28,6 +31,107 @@ logger = logging.getLogger(__name__)
 # Add initial log message to verify logging is working
 logger.info("Batch utils module initialized - Logging system ready")
 
+def new_batch_id() -> str:
+    """
+    Generate a time-ordered (UUIDv7 layout) ID for batches and requests
+    
+    The leading 48 bits are the Unix time in milliseconds, so IDs created
+    close together share a prefix and sort by creation time.
+    
+    Returns:
+        ID string in the standard UUID format
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (timestamp_ms & 0xFFFFFFFFFFFF) << 80  # unix_ts_ms
+        | 0x7 << 76                            # version 7
+        | (rand >> 68) << 64                   # 12 random bits
+        | 0x2 << 62                            # RFC 4122 variant
+        | (rand & 0x3FFFFFFFFFFFFFFF)          # 62 random bits
+    )
+    return str(uuid.UUID(int=value))
+
+def encode_batch_results(results_json: bytes) -> bytes:
+    """
+    Compress a batch's JSON-encoded validation results for storage in Redis
+    
+    Args:
+        results_json: Batch progress/results record, already JSON-encoded
+        
+    Returns:
+        gzip-compressed JSON bytes
+    """
+    return gzip.compress(results_json, compresslevel=settings.REDIS_RESULT_COMPRESSION_LEVEL)
+
+def decode_batch_results(data: bytes) -> Dict[str, Any]:
+    """
+    Deserialize a batch's validation results read from Redis
+    
+    Args:
+        data: Stored value, gzip-compressed or plain JSON
+        
+    Returns:
+        Batch progress/results record
+    """
+    # Plain JSON is still accepted for results written before compression
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    return orjson.loads(data)
+
+def dedupe_emails(emails: List[str]) -> List[str]:
+    """
+    Drop repeated addresses, keeping the first occurrence of each
+    
+    Addresses are compared exactly as given. Local parts are case-sensitive
+    (RFC 5321), and each result's email must match the input it answers.
+    
+    Args:
+        emails: List of email addresses, possibly with duplicates
+        
+    Returns:
+        Unique email addresses in their original order
+    """
+    return list(dict.fromkeys(emails))
+
+async def get_cached_results(redis_client: redis.Redis, emails: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Look up cached full validation results for emails with a single MGET
+    
+    Args:
+        redis_client: Redis client
+        emails: Email addresses to look up
+        
+    Returns:
+        Cached result for each email, or None where there is no entry
+    """
+    full_prefix = CACHE_KEY_PREFIXES["full"]
+    cached = await redis_client.mget([full_prefix + email for email in emails])
+    return [orjson.loads(value) if value else None for value in cached]
+
+async def cache_validation_results(redis_client: redis.Redis, results: List[Dict[str, Any]]) -> None:
+    """
+    Cache full validation results, keyed by email, in one pipeline
+    
+    Results with an unknown status (timeouts, unreachable servers) are not
+    cached, so the next request for those emails validates them again.
+    
+    Args:
+        redis_client: Redis client
+        results: Validation results as dicts
+    """
+    results = [result for result in results if result["status"] != "unknown"]
+    if not results:
+        return
+    
+    full_prefix = CACHE_KEY_PREFIXES["full"]
+    keys = [full_prefix + result["email"] for result in results]
+    pipe = redis_client.pipeline(transaction=False)
+    for key, result in zip(keys, results):
+        pipe.setex(key, settings.CACHE_TTL_FULL_RESULT, orjson.dumps(result))
+    index_cache_keys(pipe, "full", keys, settings.CACHE_TTL_FULL_RESULT)
+    await pipe.execute()
+
 def split_into_batches(emails: List[str]) -> List[List[str]]:
     """
     Split emails into appropriately sized batches based on total count
@@ -59,14 +163,25 @@ def split_into_batches(emails: List[str]) -> List[List[str]]:
     # Split emails into batches
     return [emails[i:i+batch_size] for i in range(0, len(emails), batch_size)]
 
-async def create_batch_tracking(redis_client: redis.Redis, request_id: str, batch_ids: List[str], total_emails: int) -> None:
+async def create_batch_tracking(
+    redis_client: redis.Redis,
+    request_id: str,
+    batch_ids: List[str],
+    batch_sizes: List[int],
+    total_emails: int
+) -> None:
     """
     Create tracking record for a multi-batch request
     
+    Besides the request record and the per-batch parent index, this creates
+    the multi_progress:<request_id> hash that workers update as they go, so
+    a status poll reads every batch's progress with a single HGETALL.
+    
     Args:
         redis_client: Redis client
         request_id: ID of the original request
         batch_ids: List of batch IDs
+        batch_sizes: Number of emails in each batch, in batch_ids order
         total_emails: Total number of emails across all batches
     """
     tracking_data = {
@@ -79,49 +194,122 @@ async def create_batch_tracking(redis_client: redis.Redis, request_id: str, batc
         "lastUpdated": datetime.utcnow().isoformat()
     }
     
+    progress_fields = {}
+    for batch_id, batch_size in zip(batch_ids, batch_sizes):
+        progress_fields[batch_id] = 0
+        progress_fields[f"{batch_id}:total"] = batch_size
+    
+    pipe = redis_client.pipeline(transaction=False)
+    
     # Store tracking data in Redis
-    await redis_client.setex(
+    pipe.setex(
         f"multi_batch:{request_id}",
         settings.REDIS_RESULT_EXPIRY,
-        json.dumps(tracking_data)
+        orjson.dumps(tracking_data)
     )
     
+    # Per-batch progress, updated by the workers
+    pipe.hset(f"multi_progress:{request_id}", mapping=progress_fields)
+    pipe.expire(f"multi_progress:{request_id}", settings.REDIS_RESULT_EXPIRY)
+    
     # Create index for each batch ID to find its parent request
     for batch_id in batch_ids:
-        await redis_client.setex(
+        pipe.setex(
             f"batch_parent:{batch_id}",
             settings.REDIS_RESULT_EXPIRY,
             request_id
         )
+    
+    await pipe.execute()
+
+async def record_batch_progress(
+    redis_client: redis.Redis,
+    request_id: str,
+    batch_id: str,
+    processed_count: int,
+    is_complete: bool
+) -> None:
+    """
+    Record a batch's progress in its parent request's progress hash
+    
+    Args:
+        redis_client: Redis client
+        request_id: ID of the multi-batch request the batch belongs to
+        batch_id: ID of the batch
+        processed_count: Number of emails validated so far in this batch
+        is_complete: Whether the batch has finished
+    """
+    progress_fields = {batch_id: processed_count}
+    if is_complete:
+        progress_fields[f"{batch_id}:complete"] = 1
+    
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hset(f"multi_progress:{request_id}", mapping=progress_fields)
+    pipe.expire(f"multi_progress:{request_id}", settings.REDIS_RESULT_EXPIRY)
+    await pipe.execute()
+
+async def mark_batches_failed(redis_client: redis.Redis, request_id: str, batch_sizes: Dict[str, int]) -> None:
+    """
+    Record batches of a multi-batch request that could not be queued
+    
+    Both the request's progress hash and each batch's results record are
+    marked, so polling either the request or the batch reports the failure.
+    
+    Args:
+        redis_client: Redis client
+        request_id: ID of the multi-batch request the batches belong to
+        batch_sizes: Number of emails in each failed batch, by batch ID
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hset(f"multi_progress:{request_id}", mapping={f"{batch_id}:failed": 1 for batch_id in batch_sizes})
+    pipe.expire(f"multi_progress:{request_id}", settings.REDIS_RESULT_EXPIRY)
+    for batch_id, batch_size in batch_sizes.items():
+        pipe.setex(
+            f"validation_results:{batch_id}",
+            settings.REDIS_RESULT_EXPIRY,
+            encode_batch_results(orjson.dumps({
+                "batchId": batch_id,
+                "isComplete": False,
+                "failed": True,
+                "validatedEmails": [],
+                "totalEmails": batch_size,
+                "processedCount": 0,
+                "lastUpdated": datetime.utcnow().isoformat()
+            }))
+        )
+    await pipe.execute()
 
 async def queue_batch_for_processing(
-    connection: aio_pika.Connection,
+    channel: aio_pika.abc.AbstractChannel,
     batch_id: str, 
     emails: List[str], 
-    validation_flags: Dict[str, bool]
+    validation_flags_json: bytes,
+    request_id: Optional[str] = None
 ) -> None:
     """
     Queue a batch of emails for processing
     
     Args:
-        connection: RabbitMQ connection
+        channel: Open RabbitMQ channel to publish on
         batch_id: Unique ID for this batch
         emails: List of emails in this batch
-        validation_flags: Validation options
+        validation_flags_json: Validation options, already JSON-encoded
+        request_id: ID of the multi-batch request this batch belongs to, if any
     """
-    channel = await connection.channel()
-    
-    # Prepare message data
-    message_data = {
-        "batchId": batch_id,
-        "emails": emails,
-        "validation_flags": validation_flags
-    }
+    # Prepare message data, splicing in the flags encoded once per request
+    message_body = (
+        b'{"batchId":' + orjson.dumps(batch_id)
+        + b',"emails":' + orjson.dumps(emails)
+        + b',"validation_flags":' + validation_flags_json
+    )
+    if request_id:
+        message_body += b',"requestId":' + orjson.dumps(request_id)
+    message_body += b'}'
     
     # Publish message to queue
     await channel.default_exchange.publish(
         aio_pika.Message(
-            body=json.dumps(message_data).encode(),
+            body=message_body,
             delivery_mode=aio_pika.DeliveryMode.PERSISTENT
         ),
         routing_key=settings.RABBITMQ_QUEUE
@@ -140,46 +328,50 @@ async def get_multi_batch_status(redis_client: redis.Redis, request_id: str) ->
     Returns:
         Aggregated status information
     """
-    # Get tracking data
-    tracking_data_json = await redis_client.get(f"multi_batch:{request_id}")
+    # Get tracking data and per-batch progress in one round trip
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.get(f"multi_batch:{request_id}")
+    pipe.hgetall(f"multi_progress:{request_id}")
+    tracking_data_json, progress = await pipe.execute()
     if not tracking_data_json:
         return None
     
-    tracking_data = json.loads(tracking_data_json)
+    tracking_data = orjson.loads(tracking_data_json)
     batch_ids = tracking_data["batchIds"]
     
     # Get status for each batch
     batch_statuses = []
     total_processed = 0
     all_complete = True
+    any_failed = False
     
     for batch_id in batch_ids:
-        batch_status_json = await redis_client.get(f"validation_results:{batch_id}")
-        if not batch_status_json:
-            batch_statuses.append({
-                "batchId": batch_id,
-                "status": "processing",
-                "processedEmails": 0,
-                "totalEmails": 0
-            })
-            all_complete = False
-            continue
-            
-        batch_status = json.loads(batch_status_json)
+        processed_count = int(progress.get(batch_id, 0))
+        is_complete = f"{batch_id}:complete" in progress
+        is_failed = f"{batch_id}:failed" in progress
+        if is_failed:
+            batch_status = "failed"
+            any_failed = True
+        else:
+            batch_status = "completed" if is_complete else "processing"
         batch_statuses.append({
             "batchId": batch_id,
-            "status": "completed" if batch_status["isComplete"] else "processing",
-            "processedEmails": batch_status["processedCount"],
-            "totalEmails": batch_status["totalEmails"]
+            "status": batch_status,
+            "processedEmails": processed_count,
+            "totalEmails": int(progress.get(f"{batch_id}:total", 0))
         })
         
-        total_processed += batch_status["processedCount"]
-        if not batch_status["isComplete"]:
+        total_processed += processed_count
+        if not is_complete:
             all_complete = False
     
     # Update tracking data
     tracking_data["processedEmails"] = total_processed
-    tracking_data["status"] = "completed" if all_complete else "processing"
+    # A batch that was never queued will not complete, so the request fails
+    if any_failed:
+        tracking_data["status"] = "failed"
+    else:
+        tracking_data["status"] = "completed" if all_complete else "processing"
     tracking_data["lastUpdated"] = datetime.utcnow().isoformat()
     tracking_data["batches"] = batch_statuses
     
@@ -192,7 +384,7 @@ async def get_multi_batch_status(redis_client: redis.Redis, request_id: str) ->
     await redis_client.setex(
         f"multi_batch:{request_id}",
         settings.REDIS_RESULT_EXPIRY,
-        json.dumps(tracking_data)
+        orjson.dumps(tracking_data)
     )
     
     return tracking_data 
\ No newline at end of file
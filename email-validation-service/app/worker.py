@@ -1,13 +1,14 @@
-import json
+import orjson
 import asyncio
 import aio_pika
 from redis import asyncio as aioredis
-from typing import List, Dict
+from typing import List, Dict, Optional
 import logging
 from datetime import datetime
 
 from .services.validator import EmailValidator
 from .config import settings
+from .utils.batch_utils import record_batch_progress, encode_batch_results, get_cached_results, cache_validation_results
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,7 +25,7 @@ class EmailValidationWorker:
         """Initialize RabbitMQ and Redis connections"""
         # Connect to Redis
         self.redis = aioredis.from_url(
-            f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
+            settings.REDIS_URL,
             password=settings.REDIS_PASSWORD,
             db=settings.REDIS_DB,
             decode_responses=True
@@ -59,20 +60,42 @@ class EmailValidationWorker:
             durable=True
         )
 
-    async def process_emails(self, batch_id: str, emails: List[str], validation_flags: Dict) -> None:
+    async def process_emails(self, batch_id: str, emails: List[str], validation_flags: Dict, request_id: Optional[str] = None) -> None:
         """Process a batch of emails and store results in Redis"""
         total_emails = len(emails)
         logger.info(f"Processing batch {batch_id} with {total_emails} emails")
         
-        # Split emails into smaller chunks
-        chunks = [emails[i:i + settings.WORKER_BATCH_SIZE] 
-                 for i in range(0, total_emails, settings.WORKER_BATCH_SIZE)]
+        # Only results of a full validation are cached; requests that skip a
+        # check must not be answered from (or feed) the result cache
+        cache_results = settings.ENABLE_RESULT_CACHE and all(validation_flags.get(flag, True) for flag in (
+            'check_mx', 'check_smtp', 'check_disposable', 'check_catch_all', 'check_blacklist'
+        ))
         
         all_results = []
+        cacheable_results = []
+        
+        # Emails fully validated before are answered from the result cache;
+        # only the rest are validated
+        emails_to_validate = emails
+        if cache_results:
+            try:
+                cached_results = await get_cached_results(self.redis, emails)
+            except Exception as e:
+                logger.error(f"Error reading cached results: {str(e)}")
+                cached_results = [None] * total_emails
+            all_results = [result for result in cached_results if result]
+            emails_to_validate = [email for email, result in zip(emails, cached_results) if not result]
+            if all_results:
+                logger.info(f"Found {len(all_results)}/{total_emails} emails of batch {batch_id} in the result cache")
+        
+        # Split emails into smaller chunks
+        chunks = [emails_to_validate[i:i + settings.WORKER_BATCH_SIZE] 
+                 for i in range(0, len(emails_to_validate), settings.WORKER_BATCH_SIZE)]
+        
         for i, chunk in enumerate(chunks):
             try:
                 # Check circuit breaker status before processing chunk
-                circuit_open = self.validator.circuit_breaker.is_open
+                circuit_open = await self.validator.circuit_breaker.is_open()
                 if circuit_open:
                     logger.warning(f"Circuit breaker is open for chunk {i+1}/{len(chunks)} - using DNS validation")
                 
@@ -92,36 +115,51 @@ class EmailValidationWorker:
                     return_exceptions=True
                 )
                 
-                # Handle any exceptions in results
+                # Handle any exceptions in results; each result is converted
+                # to a dict once and reused for every progress update
                 processed_results = []
                 for result in chunk_results:
                     if isinstance(result, Exception):
                         logger.error(f"Error processing email: {str(result)}")
                         continue
-                    processed_results.append(result)
+                    processed_results.append(result.model_dump())
                 
                 all_results.extend(processed_results)
                 
+                # Cache the chunk's results unless SMTP was skipped for it, or
+                # the validator fell back to DNS when the breaker opened
+                # mid-chunk; written once for the whole batch below
+                if cache_results and use_smtp:
+                    cacheable_results.extend(
+                        result for result in processed_results
+                        if result["details"]["general"].get("validation_method") != "dns"
+                    )
+                
                 # Update progress in Redis
                 progress = {
                     "batchId": batch_id,
                     "isComplete": False,
-                    "validatedEmails": [result.dict() for result in all_results],
+                    "validatedEmails": all_results,
                     "totalEmails": total_emails,
                     "processedCount": len(all_results),
                     "lastUpdated": datetime.utcnow().isoformat()
                 }
                 
                 # Store in Redis for status checks
+                progress_json = orjson.dumps(progress)
                 await self.redis.setex(
                     f"validation_results:{batch_id}",
                     settings.REDIS_RESULT_EXPIRY,
-                    json.dumps(progress)
+                    encode_batch_results(progress_json)
                 )
 
+                # Update the parent request's progress hash for multi-batch requests
+                if request_id:
+                    await record_batch_progress(self.redis, request_id, batch_id, len(all_results), False)
+
                 # Publish progress update
                 try:
-                    await self.redis.publish('email_validation_results', json.dumps(progress))
+                    await self.redis.publish('email_validation_results', progress_json)
                 except Exception as e:
                     logger.error(f"Error publishing progress update: {str(e)}")
                 
@@ -135,31 +173,42 @@ class EmailValidationWorker:
         final_results = {
             "batchId": batch_id,
             "isComplete": True,
-            "validatedEmails": [result.dict() for result in all_results],
+            "validatedEmails": all_results,
             "totalEmails": total_emails,
             "processedCount": len(all_results),
             "lastUpdated": datetime.utcnow().isoformat()
         }
         
         # Store final results in Redis
+        final_results_json = orjson.dumps(final_results)
         await self.redis.setex(
             f"validation_results:{batch_id}",
             settings.REDIS_RESULT_EXPIRY,
-            json.dumps(final_results)
+            encode_batch_results(final_results_json)
         )
 
+        if request_id:
+            await record_batch_progress(self.redis, request_id, batch_id, len(all_results), True)
+
+        # Write the batch's cacheable results in one pipeline
+        if cacheable_results:
+            try:
+                await cache_validation_results(self.redis, cacheable_results)
+            except Exception as e:
+                logger.error(f"Error caching validation results: {str(e)}")
+
         # Publish final results
         try:
-            await self.redis.publish('email_validation_results', json.dumps(final_results))
+            await self.redis.publish('email_validation_results', final_results_json)
         except Exception as e:
             logger.error(f"Error publishing final results: {str(e)}")
         
         # Get circuit breaker metrics for logging
-        metrics = self.validator.circuit_breaker.get_metrics()
+        metrics = await self.validator.circuit_breaker.get_metrics()
         logger.info(f"Batch {batch_id} completed. Circuit breaker status: {metrics['status']}, Consecutive timeouts: {metrics['consecutive_smtp_timeouts']}")
         
         # Reset circuit breaker at the end of the batch
-        self.validator.circuit_breaker.reset()
+        await self.validator.circuit_breaker.reset()
         
         logger.info(f"Completed batch {batch_id}")
 
@@ -167,16 +216,17 @@ class EmailValidationWorker:
         """Process a single message from RabbitMQ"""
         async with message.process():
             try:
-                body = json.loads(message.body.decode())
+                body = orjson.loads(message.body)
                 batch_id = body.get('batchId')
                 emails = body.get('emails', [])
                 validation_flags = body.get('validation_flags', {})
+                request_id = body.get('requestId')
                 
                 if not batch_id or not emails:
                     logger.error("Invalid message format")
                     return
                 
-                await self.process_emails(batch_id, emails, validation_flags)
+                await self.process_emails(batch_id, emails, validation_flags, request_id)
                 
             except Exception as e:
                 logger.error(f"Error processing message: {str(e)}")
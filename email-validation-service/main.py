@@ -1,9 +1,11 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
 from app.api.routes import router
+from app.api.deps import open_mq_connection, close_mq_connection, open_redis_pool, close_redis_pool, index_existing_cache_entries
 from app.config import settings
 from app.auth.rate_limiter import limiter
 
@@ -11,7 +13,8 @@ from app.auth.rate_limiter import limiter
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="A microservice for validating email addresses",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # Serialize JSON responses with orjson
 )
 
 # Add rate limiting
@@ -27,6 +30,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Keep one RabbitMQ connection and one Redis pool open for the lifetime of the app
+app.add_event_handler("startup", open_redis_pool)
+app.add_event_handler("startup", index_existing_cache_entries)
+app.add_event_handler("startup", open_mq_connection)
+app.add_event_handler("shutdown", close_mq_connection)
+app.add_event_handler("shutdown", close_redis_pool)
+
 # Include validation routes
 app.include_router(router, prefix=settings.API_V1_STR, tags=["email-validation"])
 
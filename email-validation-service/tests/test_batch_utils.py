@@ -0,0 +1,30 @@
+import sys
+import os
+
+# Add the parent directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings are read at import time; fill in the required ones when no .env is present
+os.environ.setdefault("RABBITMQ_HOST", "localhost")
+os.environ.setdefault("RABBITMQ_USER", "guest")
+os.environ.setdefault("RABBITMQ_PASS", "guest")
+os.environ.setdefault("REDIS_HOST", "localhost")
+os.environ.setdefault("API_KEY", "test-api-key-for-worker-tests-0123456789")
+
+from app.utils.batch_utils import dedupe_emails
+
+def test_dedupe_emails_keeps_first_occurrence_in_order():
+    """Repeated addresses are dropped and the input order is kept"""
+    emails = ["b@example.com", "a@example.com", "b@example.com", "c@example.com", "a@example.com"]
+    assert dedupe_emails(emails) == ["b@example.com", "a@example.com", "c@example.com"]
+    print("Duplicates dropped, first occurrences kept in order")
+
+def test_dedupe_emails_compares_exactly():
+    """Addresses differing only in case or whitespace are kept as given"""
+    emails = ["User@Example.com", "user@example.com", " user@example.com", "user@example.com"]
+    assert dedupe_emails(emails) == ["User@Example.com", "user@example.com", " user@example.com"]
+    print("Addresses compared exactly as given")
+
+if __name__ == "__main__":
+    test_dedupe_emails_keeps_first_occurrence_in_order()
+    test_dedupe_emails_compares_exactly()
@@ -9,7 +9,7 @@ import random
 # Add the parent directory to Python path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import redis
+from redis import asyncio as aioredis
 from app.services.circuit_breaker import CircuitBreaker
 from app.services.validator import EmailValidator
 from app.config import settings
@@ -20,8 +20,8 @@ async def test_circuit_breaker():
     print("=" * 50)
     
     # Initialize Redis client
-    redis_client = redis.from_url(
-        f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
+    redis_client = aioredis.from_url(
+        settings.REDIS_URL,
         password=settings.REDIS_PASSWORD,
         db=settings.REDIS_DB,
         decode_responses=True
@@ -31,27 +31,26 @@ async def test_circuit_breaker():
     circuit_breaker = CircuitBreaker(redis_client)
     
     # Reset circuit breaker state
-    circuit_breaker.reset()
+    await circuit_breaker.reset()
     print("Circuit breaker reset to closed state")
     
     # Check initial state
-    print(f"Initial state - Circuit open: {circuit_breaker.is_open}")
-    print(f"Initial metrics: {json.dumps(circuit_breaker.get_metrics(), indent=2)}")
+    print(f"Initial state - Circuit open: {await circuit_breaker.is_open()}")
+    print(f"Initial metrics: {json.dumps(await circuit_breaker.get_metrics(), indent=2)}")
     
     # Simulate failures
     print("\nSimulating SMTP failures...")
     for i in range(settings.SMTP_CIRCUIT_BREAKER_THRESHOLD + 2):
-        circuit_breaker.record_attempt()
-        circuit_breaker.record_failure()
+        await circuit_breaker.record_smtp_timeout()
         print(f"Failure {i+1} recorded")
         
         # Check if circuit is open
-        if circuit_breaker.is_open:
+        if await circuit_breaker.is_open():
             print(f"Circuit opened after {i+1} failures")
             break
     
     # Check metrics after failures
-    print(f"\nMetrics after failures: {json.dumps(circuit_breaker.get_metrics(), indent=2)}")
+    print(f"\nMetrics after failures: {json.dumps(await circuit_breaker.get_metrics(), indent=2)}")
     
     # Test validation with circuit open
     validator = EmailValidator()
@@ -108,14 +107,14 @@ async def test_circuit_breaker():
     
     # Reset circuit breaker
     print("\nResetting circuit breaker...")
-    circuit_breaker.reset()
+    await circuit_breaker.reset()
     
     # Check final state
-    print(f"Final state - Circuit open: {circuit_breaker.is_open}")
-    print(f"Final metrics: {json.dumps(circuit_breaker.get_metrics(), indent=2)}")
+    print(f"Final state - Circuit open: {await circuit_breaker.is_open()}")
+    print(f"Final metrics: {json.dumps(await circuit_breaker.get_metrics(), indent=2)}")
     
     # Clean up
-    redis_client.close()
+    await redis_client.close()
     print("\nCircuit breaker test completed")
     print("=" * 50)
 
@@ -0,0 +1,87 @@
+import asyncio
+import sys
+import os
+import orjson
+from unittest.mock import AsyncMock, MagicMock, patch
+
+# Add the parent directory to Python path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings are read at import time; fill in the required ones when no .env is present
+os.environ.setdefault("RABBITMQ_HOST", "localhost")
+os.environ.setdefault("RABBITMQ_USER", "guest")
+os.environ.setdefault("RABBITMQ_PASS", "guest")
+os.environ.setdefault("REDIS_HOST", "localhost")
+os.environ.setdefault("API_KEY", "test-api-key-for-worker-tests-0123456789")
+
+def test_worker_imports():
+    """The worker module and everything it imports from batch_utils resolve"""
+    from app import worker
+
+    assert worker.EmailValidationWorker is not None
+    assert callable(worker.get_cached_results)
+    assert callable(worker.cache_validation_results)
+    print("app.worker imported successfully")
+
+def _validation_result(email: str, status: str = "valid") -> dict:
+    return {
+        "email": email,
+        "status": status,
+        "details": {"general": {"validation_method": "smtp"}},
+    }
+
+def test_cached_emails_are_not_revalidated():
+    """Emails found in the result cache are answered without validating them"""
+    from app import worker
+    from app.services.cache_service import CACHE_KEY_PREFIXES
+
+    cached = _validation_result("cached@example.com")
+    redis_client = MagicMock()
+    redis_client.mget = AsyncMock(return_value=[orjson.dumps(cached), None])
+    redis_client.setex = AsyncMock()
+    redis_client.publish = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    redis_client.pipeline.return_value = pipe
+
+    fresh = MagicMock()
+    fresh.model_dump.return_value = _validation_result("fresh@example.com")
+    validator = MagicMock()
+    validator.validate_email = AsyncMock(return_value=fresh)
+    validator.circuit_breaker.is_open = AsyncMock(return_value=False)
+    validator.circuit_breaker.get_metrics = AsyncMock(
+        return_value={"status": "closed", "consecutive_smtp_timeouts": 0}
+    )
+    validator.circuit_breaker.reset = AsyncMock()
+
+    with patch.object(worker, "EmailValidator", return_value=validator):
+        email_worker = worker.EmailValidationWorker()
+    email_worker.redis = redis_client
+
+    asyncio.run(email_worker.process_emails(
+        "batch-1", ["cached@example.com", "fresh@example.com"], {}
+    ))
+
+    # Both emails are looked up with one MGET, only the miss is validated
+    full_prefix = CACHE_KEY_PREFIXES["full"]
+    redis_client.mget.assert_awaited_once_with(
+        [full_prefix + "cached@example.com", full_prefix + "fresh@example.com"]
+    )
+    validated = [call.args[0] for call in validator.validate_email.await_args_list]
+    assert validated == ["fresh@example.com"]
+
+    # The final results hold the cached and the fresh result
+    final = orjson.loads(redis_client.publish.await_args_list[-1].args[1])
+    assert final["isComplete"] is True
+    assert [result["email"] for result in final["validatedEmails"]] == [
+        "cached@example.com", "fresh@example.com"
+    ]
+
+    # Only the freshly validated result is written back to the cache
+    written = [call.args[0] for call in pipe.setex.call_args_list]
+    assert written == [full_prefix + "fresh@example.com"]
+    print("Cached emails were answered without revalidation")
+
+if __name__ == "__main__":
+    test_worker_imports()
+    test_cached_emails_are_not_revalidated()